@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from data.models import Contract, ContractType
 from typing import List
 import os
+from data.metrics import profiled
 
 
 def compute_contract_jump_threshold(contracts: List[Contract]) -> float:
@@ -86,6 +87,7 @@ def gather_activation_records(
     return pd.DataFrame(records)
 
 
+@profiled("plotting")
 def plot_activation_times(
     contracts: List[Contract],
 ):
@@ -5,6 +5,7 @@ from pandera.typing import DataFrame
 from tester.models import CandleModel
 import matplotlib.pyplot as plt
 import os
+from data.metrics import profiled
 
 
 def compute_eod_movements(
@@ -22,6 +23,7 @@ def compute_eod_movements(
     return changes
 
 
+@profiled("plotting")
 def plot_direction_clusters(
     stock_candles_by_date: Dict[str, DataFrame[CandleModel]],
 ):
@@ -9,6 +9,7 @@ from data.models import Contract, ContractType
 from tester.models import CandleModel
 from strategy.base_strategy import MARKET_CLOSE
 import os
+from data.metrics import profiled
 
 
 def compute_expiry_gains(
@@ -51,6 +52,7 @@ def compute_expiry_gains(
     return percent_gains
 
 
+@profiled("plotting")
 def plot_expiry_gains(
     contracts: List[Contract],
     stock_candles_by_date: Dict[str, DataFrame[CandleModel]],
@@ -0,0 +1,56 @@
+from typing import List
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+import os
+from data.metrics import profiled
+from tester.outcomes import OutcomeMatrix, outcomes_frame
+
+
+@profiled("plotting")
+def plot_outcome_heatmap(
+    matrices: List[OutcomeMatrix],
+    time_bucket: int = 15,
+    distance_step: float = 5.0,
+    path: str = os.path.join("artifacts", "outcome_heatmap.png"),
+):
+    """
+    Median % return by entry time (rows, in `time_bucket`-minute buckets) and
+    strike distance from the stock at entry (columns, in `distance_step`
+    points, positive out of the money), calls and puts side by side.
+    """
+    df = outcomes_frame(matrices)
+    if df.empty:
+        print("No outcomes to plot.")
+        return
+
+    minutes = np.array([t.hour * 60 + t.minute for t in df["entry_time"]])
+    bucket = minutes // time_bucket * time_bucket
+    df["Entry"] = [f"{m // 60:02d}:{m % 60:02d}" for m in bucket]
+    df["Distance"] = (np.round(df["distance"] / distance_step) * distance_step).astype(int)
+    df["Return"] = df["pct_change"] * 100
+
+    fig, axes = plt.subplots(1, 2, figsize=(16, 8), sharey=True)
+    for ax, (label, is_call) in zip(axes, [("Calls", True), ("Puts", False)]):
+        table = df[df["is_call"] == is_call].pivot_table(
+            index="Entry", columns="Distance", values="Return", aggfunc="median"
+        )
+        if table.empty:
+            ax.set_title(f"{label}: no entries")
+            continue
+        # Cheap far-OTM entries return thousands of percent; cap the scale.
+        sns.heatmap(
+            table,
+            cmap="RdYlGn",
+            center=0,
+            vmin=-100,
+            vmax=100,
+            ax=ax,
+            cbar_kws={"label": "Median % Return"},
+        )
+        ax.set_title(f"{label}: median return by entry time and strike distance")
+        ax.set_xlabel("Strike distance from stock (pts, + = OTM)")
+        ax.set_ylabel("Entry time (UTC)")
+
+    plt.tight_layout()
+    plt.savefig(path)
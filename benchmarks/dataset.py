@@ -0,0 +1,172 @@
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+import numpy as np
+
+from constants import MARKET_CLOSE, MARKET_OPEN
+from data.api.base import BaseAPI
+from data.funcs import get_option_symbol, get_stock_symbol
+from data.models import Candle, Contract, ContractType
+from data.options.process_0dte import save_contracts_as_json
+from data.options.synthetic_0dte import SyntheticDataGenerator
+from data.stocks.process_stocks import BASE_DIR as STOCK_DIR
+from tester.backtester import get_trading_days
+
+FIRST_DAY = date(2025, 1, 2)
+SPOT = 6000.0
+ANNUAL_VOL = 0.18
+MINUTES_PER_YEAR = 252 * 390
+TICK = 0.05
+
+
+def dataset_days(days: int) -> List[date]:
+    # Roughly 252 trading days per 365; overshoot, then cut.
+    return get_trading_days(FIRST_DAY, FIRST_DAY + timedelta(days=days * 2 + 10))[:days]
+
+
+def _gbm_day(
+    rng: np.random.Generator, start: float, minutes: int
+) -> Dict[str, np.ndarray]:
+    sigma = ANNUAL_VOL / np.sqrt(MINUTES_PER_YEAR)
+    steps = rng.normal(-0.5 * sigma**2, sigma, minutes)
+    close = start * np.exp(np.cumsum(steps))
+    open_ = np.concatenate([[start], close[:-1]])
+    wick = np.abs(rng.normal(0, sigma, (2, minutes))) * close
+    high = np.maximum(open_, close) + wick[0]
+    low = np.minimum(open_, close) - wick[1]
+    return {"open": open_, "high": high, "low": low, "close": close}
+
+
+def _price(
+    generator: SyntheticDataGenerator,
+    spot: np.ndarray,
+    strikes: np.ndarray,
+    T: np.ndarray,
+    iv: np.ndarray,
+    contract_type: ContractType,
+) -> np.ndarray:
+    # One bs_price call per minute, vectorized over the strikes.
+    prices = np.array(
+        [
+            generator.bs_price(s, strikes, t, generator.r, iv, contract_type)
+            for s, t in zip(spot, T)
+        ]
+    )
+    # Quoted on the tick grid, never below one tick, like listed options.
+    return np.maximum(np.round(prices / TICK) * TICK, TICK)
+
+
+def generate_dataset(
+    symbol: str, days: int, strikes: int, minutes: int = 390, seed: int = 0
+) -> Dict[str, int]:
+    """
+    Writes a deterministic dataset into the storage layout under the current
+    directory: a GBM stock path of `minutes` bars per day from MARKET_OPEN
+    and, per day, a call and a put at each of `strikes` strikes around the
+    open, priced with SyntheticDataGenerator's Black-Scholes.
+
+    :return: The dataset's size.
+    """
+    minutes = min(minutes, 390)
+    rng = np.random.default_rng(seed)
+    generator = SyntheticDataGenerator()
+    step = generator.strike_step
+
+    stock_candles: List[dict] = []
+    contract_count = 0
+    spot = SPOT
+    for day in dataset_days(days):
+        session_open = datetime.combine(day, MARKET_OPEN, tzinfo=timezone.utc)
+        timestamps = [session_open + timedelta(minutes=i) for i in range(minutes)]
+        bars = _gbm_day(rng, spot, minutes)
+        spot = bars["close"][-1] * np.exp(rng.normal(0, 0.005))  # Overnight gap.
+
+        volume = rng.integers(1_000, 50_000, minutes).astype(float)
+        vwap = (bars["high"] + bars["low"] + bars["close"]) / 3
+        for i, ts in enumerate(timestamps):
+            stock_candles.append(
+                {
+                    "open": bars["open"][i],
+                    "high": bars["high"][i],
+                    "low": bars["low"][i],
+                    "close": bars["close"][i],
+                    "volume": volume[i],
+                    "vwap": vwap[i],
+                    "timestamp": ts.isoformat(),
+                }
+            )
+        # Stored sessions end with a bar at MARKET_CLOSE, which settlement reads.
+        last = bars["close"][-1]
+        stock_candles.append(
+            {
+                "open": last,
+                "high": last,
+                "low": last,
+                "close": last,
+                "volume": 0.0,
+                "vwap": last,
+                "timestamp": datetime.combine(day, MARKET_CLOSE, tzinfo=timezone.utc).isoformat(),
+            }
+        )
+
+        center = round(bars["open"][0] / step) * step
+        strike_grid = center + step * (np.arange(strikes) - strikes // 2)
+        expiry = datetime.combine(day, MARKET_CLOSE, tzinfo=timezone.utc)
+        # Years to expiry at each bar's close, as the synthetic generator does.
+        T = (390 - np.arange(1, minutes + 1)) / 390 / 252
+        T = np.maximum(T, 1e-9)
+        contracts: List[Contract] = []
+        for contract_type in ContractType:
+            iv = np.maximum(
+                ANNUAL_VOL + generator.iv_skew_slope * (center - strike_grid) / step, 0.01
+            )
+            prices = {
+                field: _price(generator, bars[field], strike_grid, T, iv, contract_type)
+                for field in ("open", "high", "low", "close")
+            }
+            high = np.maximum(prices["high"], prices["low"])
+            low = np.minimum(prices["high"], prices["low"])
+            for k, strike in enumerate(strike_grid):
+                contracts.append(
+                    Contract(
+                        symbol=BaseAPI.format_occ_option_symbol(
+                            symbol=get_option_symbol(symbol),
+                            exp_date=expiry,
+                            contract_type=contract_type,
+                            strike=float(strike),
+                        ),
+                        underlying_symbol=symbol,
+                        expiry=expiry,
+                        strike=float(strike),
+                        contract_type=contract_type,
+                        data=[
+                            Candle(
+                                open=float(prices["open"][i, k]),
+                                high=float(high[i, k]),
+                                low=float(low[i, k]),
+                                close=float(prices["close"][i, k]),
+                                volume=1.0,
+                                vwap=float(prices["close"][i, k]),
+                                timestamp=ts,
+                            )
+                            for i, ts in enumerate(timestamps)
+                        ],
+                    )
+                )
+        # Written per day, so memory stays flat at any dataset size.
+        save_contracts_as_json(contracts, symbol)
+        contract_count += len(contracts)
+
+    os.makedirs(STOCK_DIR, exist_ok=True)
+    with open(os.path.join(STOCK_DIR, f"{get_stock_symbol(symbol)}.json"), "w") as f:
+        json.dump(stock_candles, f)
+
+    return {
+        "days": days,
+        "strikes": strikes,
+        "minutes": minutes,
+        "contracts": contract_count,
+        "candles": len(stock_candles) + contract_count * minutes,
+    }
@@ -0,0 +1,187 @@
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+
+from analysis.activation import (
+    compute_contract_jump_threshold,
+    gather_activation_records,
+    plot_activation_times,
+)
+from analysis.direction import compute_eod_movements, plot_direction_clusters
+from analysis.expiry import compute_expiry_gains, plot_expiry_gains
+from benchmarks.dataset import dataset_days, generate_dataset
+from data.data_handler import DataHandler
+from data.options.synthetic_0dte import SyntheticDataGenerator
+from strategy.exp_strategy import ExpStrategy
+from tester.backtester import ENGINES, Backtester
+
+SYMBOL = "BENCH"
+
+
+@contextmanager
+def _inside(path: str):
+    # Storage paths are relative, so a dataset lives wherever we chdir to.
+    previous = os.getcwd()
+    os.makedirs(path, exist_ok=True)
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _best(run: Callable[[Any], Any], repeat: int, setup: Callable[[], Any] = lambda: None) -> float:
+    """
+    Fastest of `repeat` timed calls of `run(setup())`; setup is not timed.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        run(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def dataset_label(days: int, strikes: int, minutes: int) -> str:
+    return f"{days}d x {strikes}k x {minutes}m"
+
+
+def run_suite(
+    days: int,
+    strikes: int,
+    minutes: int = 390,
+    seed: int = 0,
+    repeat: int = 1,
+    synthetic_days: int = 1,
+    workdir: Optional[str] = None,
+) -> dict:
+    """
+    Builds a dataset of `days` × `strikes` × `minutes` in `workdir` (a
+    temporary directory by default) and times every stage on it.
+    """
+    root = workdir or tempfile.mkdtemp(prefix="eodalgo-bench-")
+    stages: Dict[str, Dict[str, float]] = {}
+    try:
+        with _inside(os.path.join(root, "main")):
+            start = time.perf_counter()
+            dataset = generate_dataset(SYMBOL, days, strikes, minutes, seed)
+            stages["generate_dataset"] = {"seconds": time.perf_counter() - start}
+
+            seconds = _best(lambda _: DataHandler(SYMBOL), repeat)
+            stages["data_handler_load"] = {
+                "seconds": seconds,
+                "candles_per_second": dataset["candles"] / seconds,
+            }
+
+            trading_days = dataset_days(days)
+            for engine in ENGINES:
+                seconds = _best(
+                    lambda data: Backtester(
+                        ExpStrategy(SYMBOL), engine=engine, data=data
+                    ).run(trading_days[0], trading_days[-1]),
+                    repeat,
+                    setup=lambda: DataHandler(SYMBOL),
+                )
+                stages[f"backtest_{engine}"] = {
+                    "seconds": seconds,
+                    "days_per_second": days / seconds,
+                }
+
+            data = DataHandler(SYMBOL)
+            contracts = [c for day in data.contracts_by_date.values() for c in day]
+            candles = data.stock_candles_dt_df
+            thresholds = compute_contract_jump_threshold(contracts)
+            os.makedirs("artifacts", exist_ok=True)
+            analyses = {
+                "compute_contract_jump_threshold": lambda: compute_contract_jump_threshold(
+                    contracts
+                ),
+                "gather_activation_records": lambda: gather_activation_records(
+                    contracts, *thresholds
+                ),
+                "plot_activation_times": lambda: plot_activation_times(contracts),
+                "compute_eod_movements": lambda: compute_eod_movements(candles),
+                "plot_direction_clusters": lambda: plot_direction_clusters(candles),
+                "compute_expiry_gains": lambda: compute_expiry_gains(contracts, candles),
+                "plot_expiry_gains": lambda: plot_expiry_gains(contracts, candles),
+            }
+            for name, analysis in analyses.items():
+                stages[f"analysis_{name}"] = {"seconds": _best(lambda _: analysis(), repeat)}
+
+        # The generator prices a full chain from one call and put per day.
+        if synthetic_days > 0:
+            with _inside(os.path.join(root, "synthetic")), np.errstate(all="ignore"):
+                generate_dataset(SYMBOL, synthetic_days, 1, minutes, seed)
+                seconds = _best(
+                    lambda _: SyntheticDataGenerator().generate_synthetic_data(SYMBOL),
+                    repeat,
+                )
+                stages["synthetic_chain"] = {
+                    "seconds": seconds,
+                    "days_per_second": synthetic_days / seconds,
+                }
+    finally:
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "dataset": dict(dataset, label=dataset_label(days, strikes, minutes), seed=seed),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        },
+        "stages": stages,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2) -> Dict[str, dict]:
+    """
+    Per stage, current and baseline seconds for the same dataset shape; a
+    stage regressed if it got more than `tolerance` slower.
+    """
+    reference = baseline.get(results["dataset"]["label"], {}).get("stages", {})
+    comparison = {}
+    for stage, stats in results["stages"].items():
+        if stage not in reference:
+            continue
+        ratio = stats["seconds"] / reference[stage]["seconds"]
+        comparison[stage] = {
+            "baseline_seconds": reference[stage]["seconds"],
+            "seconds": stats["seconds"],
+            "ratio": ratio,
+            "regression": ratio > 1 + tolerance,
+        }
+    return comparison
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: dict):
+    """
+    Stores `results` as the baseline for its dataset shape, keeping the
+    baselines of other shapes.
+    """
+    baseline = load_baseline(path)
+    baseline[results["dataset"]["label"]] = results
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
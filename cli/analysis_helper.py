@@ -1,13 +1,15 @@
 from analysis.activation import plot_activation_times
 from analysis.direction import plot_direction_clusters
 from analysis.expiry import plot_expiry_gains
+from typing import Optional
+
 from data.data_handler import DataHandler
 
 
-def analysis_command(symbol: str):
+def analysis_command(symbol: str, data: Optional[DataHandler] = None):
     print(f"Running EOD analysis for {symbol}...")
 
-    handler = DataHandler(symbol)
+    handler = data or DataHandler(symbol)
 
     all_contracts = []
     for daily_contracts in handler.contracts_by_date.values():
@@ -1,14 +1,77 @@
+from typing import List, Optional
+
 from constants import END_DT, START_DT
+from data.data_handler import DataHandler
 from strategy.exp_strategy import ExpStrategy
-from tester.backtester import Backtester
+from tester.backtester import Backtester, get_trading_days
+from tester.cache import DayResultCache
+from tester.checkpoint import Checkpoint
+from tester.multi_symbol import MultiSymbolBacktester
+from tester.parallel import ParallelBacktester
 
+STRATEGIES = {
+    "Expiration": ExpStrategy,
+}
 
-def backtest_command(symbol: str, strategy_name: str):
-    if strategy_name == "Expiration":
-        strategy = ExpStrategy(symbol=symbol)
-    else:
+
+def backtest_command(
+    symbol: str,
+    strategy_name: str,
+    engine: str = "pandas",
+    workers: int = 1,
+    chunk_size: int = 5,
+    prefilter: bool = True,
+    cache_dir: Optional[str] = None,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = 20,
+    resume: bool = False,
+    data: Optional[DataHandler] = None,
+):
+    if strategy_name not in STRATEGIES:
         raise ValueError(f"Unknown strategy: {strategy_name}")
+    strategy = STRATEGIES[strategy_name](symbol=symbol)
+    if resume and not checkpoint_path:
+        raise ValueError("--resume requires --checkpoint.")
+    cache = DayResultCache(cache_dir) if cache_dir else None
+    checkpoint = Checkpoint(checkpoint_path, checkpoint_every) if checkpoint_path else None
 
-    backtester = Backtester(strategy)
+    if workers > 1:
+        backtester = ParallelBacktester(
+            strategy,
+            workers=workers,
+            chunk_size=chunk_size,
+            engine=engine,
+            prefilter=prefilter,
+            cache=cache,
+            checkpoint=checkpoint,
+            resume=resume,
+            data=data,
+        )
+    else:
+        backtester = Backtester(
+            strategy,
+            engine=engine,
+            prefilter=prefilter,
+            cache=cache,
+            checkpoint=checkpoint,
+            resume=resume,
+            data=data,
+        )
     portfolio = backtester.run(start_date=START_DT, end_date=END_DT)
-    portfolio.summary()
+    portfolio.summary(get_trading_days(START_DT, END_DT))
+
+
+def multi_symbol_command(
+    symbols: List[str],
+    strategy_name: str,
+    engine: str = "cursor",
+    workers: Optional[int] = None,
+):
+    if strategy_name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+
+    tester = MultiSymbolBacktester(
+        STRATEGIES[strategy_name], symbols, engine=engine, workers=workers
+    )
+    tester.run(start_date=START_DT, end_date=END_DT)
+    tester.summary()
@@ -0,0 +1,46 @@
+import json
+from typing import Optional
+
+from benchmarks.suite import compare, load_baseline, run_suite, save_baseline
+
+
+def benchmark_command(
+    days: int,
+    strikes: int,
+    minutes: int = 390,
+    seed: int = 0,
+    repeat: int = 1,
+    synthetic_days: int = 1,
+    output: str = "benchmarks/results.json",
+    baseline_path: str = "benchmarks/baseline.json",
+    update_baseline: bool = False,
+    tolerance: float = 0.2,
+    workdir: Optional[str] = None,
+) -> bool:
+    """
+    Runs the benchmark suite and compares it with the stored baseline.
+
+    :return: Whether any stage regressed.
+    """
+    results = run_suite(days, strikes, minutes, seed, repeat, synthetic_days, workdir)
+    results["comparison"] = compare(results, load_baseline(baseline_path), tolerance)
+
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"Dataset {results['dataset']['label']}: {results['dataset']['candles']} candles")
+    for stage, stats in results["stages"].items():
+        line = f"  {stage:<42} {stats['seconds']:>9.3f}s"
+        if stage in results["comparison"]:
+            c = results["comparison"][stage]
+            flag = "  REGRESSION" if c["regression"] else ""
+            line += f"  {c['ratio']:>5.2f}x baseline{flag}"
+        print(line)
+    if not results["comparison"]:
+        print(f"No baseline for this dataset in {baseline_path}")
+    print(f"Results written to {output}")
+
+    if update_baseline:
+        save_baseline(baseline_path, results)
+        print(f"Baseline updated in {baseline_path}")
+    return any(c["regression"] for c in results["comparison"].values())
@@ -1,47 +1,211 @@
+import os
+from typing import List
+
 import typer
 from cli.analysis_helper import analysis_command
-from cli.backtest_helper import backtest_command
-from constants import END_DT, START_DT
-from data.api.polygon import PolygonAPI
-from data.options.fetch_0dte import Fetch0DTE
-from data.options.synthetic_0dte import SyntheticDataGenerator
+from cli.benchmark_helper import benchmark_command
+from cli.backtest_helper import backtest_command, multi_symbol_command
+from cli.compare_helper import compare_command
+from cli.daemon import DEFAULT_SOCKET, serve, submit
+from cli.data_helper import (
+    data_command,
+    synthetic_clean_command,
+    synthetic_data_command,
+)
+from cli.outcomes_helper import outcomes_command
+from cli.replay_helper import replay_command
+from cli.shard_helper import (
+    shard_init_command,
+    shard_merge_command,
+    shard_worker_command,
+)
+from cli.sweep_helper import sweep_command, walk_forward_command
+from data.metrics import profiling
 
 app = typer.Typer()
 
+PROFILE_HELP = "Write per-stage wall times and call counts to this JSON file."
+DAEMON_HELP = "Run the job on the warm data daemon listening on this socket."
 
-def data_command(symbol):
-    print(f"Pulling data for {symbol} from {START_DT} to {END_DT}")
-    api = PolygonAPI()
-    fetcher = Fetch0DTE(api, api, START_DT, END_DT)
-    contracts = fetcher.fetch_0dte_bars_agg("SPX")
-    print(f"Fetched {len(contracts)} contracts for {symbol}")
 
-def synthetic_data_command(symbol):
-    print(f"Pulling synthetic data for {symbol} from {START_DT} to {END_DT}")
-    gen = SyntheticDataGenerator()
-    contracts = gen.generate_synthetic_data("SPX")
-    print(f"Fetched {len(contracts)} synthetic contracts for {symbol}")
+@app.command()
+def backtest(
+    symbol: str = "SPX",
+    strategy_name: str = "Expiration",
+    engine: str = typer.Option("pandas", help="Backtest engine: pandas or cursor."),
+    workers: int = typer.Option(1, help="Worker processes; days run in parallel if > 1."),
+    chunk_size: int = typer.Option(5, help="Trading days per worker task."),
+    prefilter: bool = typer.Option(True, help="Skip days rejected by the strategy's day filters."),
+    cache_dir: str = typer.Option(None, help="Reuse per-day results cached in this directory."),
+    checkpoint: str = typer.Option(None, help="Save progress to this file while running."),
+    checkpoint_every: int = typer.Option(20, help="Trading days between checkpoints."),
+    resume: bool = typer.Option(False, help="Continue from the --checkpoint file."),
+    profile: str = typer.Option(None, help=PROFILE_HELP),
+    daemon: str = typer.Option(None, help=DAEMON_HELP),
+):
+    """
+    Runs the backtest for the specified strategy and symbol.
+    """
+    args = dict(
+        symbol=symbol,
+        strategy_name=strategy_name,
+        engine=engine,
+        workers=workers,
+        chunk_size=chunk_size,
+        prefilter=prefilter,
+        cache_dir=cache_dir and os.path.abspath(cache_dir),
+        checkpoint_path=checkpoint and os.path.abspath(checkpoint),
+        checkpoint_every=checkpoint_every,
+        resume=resume,
+    )
+    if daemon:
+        if not submit(daemon, "backtest", args, profile):
+            raise typer.Exit(1)
+        return
+    with profiling(profile):
+        backtest_command(**args)
+
 
-def synthetic_clean_command(symbol):
-    print(f"Cleaning synthetic data for {symbol}")
-    gen = SyntheticDataGenerator()
-    gen.clean_synthetic_data("SPX")
+@app.command()
+def multi_symbol(
+    symbol: List[str] = typer.Option(
+        ["SPX", "SPY", "QQQ", "IWM"], help="Underlyings to backtest. Repeatable."
+    ),
+    strategy_name: str = "Expiration",
+    engine: str = typer.Option("cursor", help="Backtest engine: pandas or cursor."),
+    workers: int = typer.Option(None, help="Worker processes (default: one per symbol)."),
+):
+    """
+    Backtests the strategy on several underlyings in parallel and combines the results.
+    """
+    multi_symbol_command(symbol, strategy_name, engine, workers)
 
 
 @app.command()
-def backtest(symbol: str = "SPX", strategy_name: str = "Expiration"):
+def compare(
+    symbol: str = "SPX",
+    strategy_name: str = "Expiration",
+    variant: List[str] = typer.Option(
+        None, help="name=value,... constructor overrides for one variant. Repeatable."
+    ),
+    prefilter: bool = typer.Option(True, help="Skip days rejected by every variant's day filters."),
+):
     """
-    Runs the backtest for the specified strategy and symbol.
+    Backtests several variants of a strategy in one pass and compares their stats.
+    """
+    compare_command(symbol, strategy_name, variant, prefilter)
+
+
+@app.command()
+def sweep(
+    symbol: str = "SPX",
+    strategy_name: str = "Expiration",
+    param: List[str] = typer.Option(
+        ..., help="name=v1,v2,... or name=low..high; times as HH:MM. Repeatable."
+    ),
+    samples: int = typer.Option(0, help="Random search size; 0 runs the full grid."),
+    seed: int = 0,
+    workers: int = typer.Option(None, help="Worker processes (default: CPU count)."),
+    output: str = typer.Option("sweep_results.jsonl", help="JSON lines results file."),
+):
     """
-    backtest_command(symbol, strategy_name)
+    Backtests a grid or random sample of strategy parameters on shared data.
+    """
+    sweep_command(symbol, strategy_name, param, samples, seed, workers, output)
+
+
+@app.command()
+def shard_init(
+    queue: str = typer.Option(..., help="Queue directory on the shared filesystem."),
+    symbol: str = "SPX",
+    strategy_name: str = "Expiration",
+    param: List[str] = typer.Option(
+        None, help="name=v1,v2,... or name=low..high; times as HH:MM. Repeatable."
+    ),
+    samples: int = typer.Option(0, help="Random search size; 0 runs the full grid."),
+    seed: int = 0,
+    days_per_unit: int = typer.Option(20, help="Trading days per work unit."),
+    engine: str = typer.Option("cursor", help="Backtest engine: pandas or cursor."),
+):
+    """
+    Splits a backtest or sweep into work units in a shared queue directory.
+    """
+    shard_init_command(
+        queue, symbol, strategy_name, param, samples, seed, days_per_unit, engine
+    )
+
+
+@app.command()
+def shard_worker(
+    queue: str = typer.Option(..., help="Queue directory on the shared filesystem."),
+    worker: str = typer.Option(None, help="Worker name (default: host-pid)."),
+    lease: float = typer.Option(600.0, help="Seconds without progress before a unit is reclaimed."),
+):
+    """
+    Claims and runs work units from a shared queue until none is left.
+    """
+    shard_worker_command(queue, worker, lease)
 
 
 @app.command()
-def data(symbol: str = "SPX"):
+def shard_merge(
+    queue: str = typer.Option(..., help="Queue directory on the shared filesystem."),
+    output: str = typer.Option("sweep_results.jsonl", help="JSON lines results file for sweeps."),
+):
+    """
+    Combines the results of a finished queue into portfolios or a sweep report.
+    """
+    shard_merge_command(queue, output)
+
+
+@app.command()
+def walk_forward(
+    symbol: str = "SPX",
+    strategy_name: str = "Expiration",
+    param: List[str] = typer.Option(
+        ..., help="name=v1,v2,... or name=low..high; times as HH:MM. Repeatable."
+    ),
+    samples: int = typer.Option(0, help="Random search size; 0 uses the full grid."),
+    seed: int = 0,
+    in_sample: int = typer.Option(60, help="Trading days per in-sample window."),
+    out_of_sample: int = typer.Option(20, help="Trading days per out-of-sample window."),
+    step: int = typer.Option(None, help="Days between windows (default: out-of-sample)."),
+    objective: str = typer.Option("total_pnl", help="Portfolio.stats() key to maximize."),
+    cache_dir: str = typer.Option(".cache/walk_forward", help="Per-day result cache."),
+):
+    """
+    Optimizes parameters on rolling in-sample windows and evaluates them out of sample.
+    """
+    walk_forward_command(
+        symbol,
+        strategy_name,
+        param,
+        samples,
+        seed,
+        in_sample,
+        out_of_sample,
+        step,
+        objective,
+        cache_dir,
+    )
+
+
+@app.command()
+def data(
+    symbol: str = "SPX",
+    metrics_path: str = typer.Option(
+        None, help="Write fetch metrics here (.json for JSON, otherwise Prometheus text)."
+    ),
+    metrics_interval: float = typer.Option(
+        30.0, help="Seconds between periodic metrics snapshots."
+    ),
+    profile: str = typer.Option(None, help=PROFILE_HELP),
+):
     """
     Fetches the 0DTE data for the specified symbol.
     """
-    data_command(symbol)
+    with profiling(profile):
+        data_command(symbol, metrics_path, metrics_interval)
 
 @app.command()
 def synthetic_clean(symbol: str = "SPX"):
@@ -51,19 +215,115 @@ def synthetic_clean(symbol: str = "SPX"):
     synthetic_clean_command(symbol)
 
 @app.command()
-def synthetic_data(symbol: str = "SPX"):
+def synthetic_data(
+    symbol: str = "SPX",
+    profile: str = typer.Option(None, help=PROFILE_HELP),
+    daemon: str = typer.Option(None, help=DAEMON_HELP),
+):
     """
     Fetches the 0DTE data for the specified symbol.
     """
-    synthetic_data_command(symbol)
+    if daemon:
+        if not submit(daemon, "synthetic-data", {"symbol": symbol}, profile):
+            raise typer.Exit(1)
+        return
+    with profiling(profile):
+        synthetic_data_command(symbol)
 
 
 @app.command()
-def analysis(symbol: str = "SPX"):
+def replay(
+    symbol: str = "SPX",
+    strategy_name: str = "Expiration",
+    speed: float = typer.Option(0.0, help="Session minutes per real minute; 0 replays as fast as possible."),
+    budget: float = typer.Option(1.0, help="Decision latency budget per bar, in seconds."),
+    feed_file: str = typer.Option(None, help="Follow this file of JSON minute bars instead of reading storage."),
+    record: str = typer.Option(None, help="Write the stored bars to this feed file instead of trading."),
+    idle_timeout: float = typer.Option(None, help="Stop following --feed-file after this many idle seconds."),
+    report: str = typer.Option(None, help="Write the latency report to this JSON file."),
+):
+    """
+    Paper-trades the strategy on replayed minute bars and measures decision latency.
+    """
+    replay_command(
+        symbol, strategy_name, speed, budget, feed_file, record, idle_timeout, report
+    )
+
+
+@app.command()
+def outcomes(
+    symbol: str = "SPX",
+    start_time: str = typer.Option("13:30", help="First entry minute (UTC, HH:MM)."),
+    end_time: str = typer.Option("19:59", help="Last entry minute (UTC, HH:MM)."),
+    stop_loss: float = typer.Option(None, help="Exit at this fractional loss; omit to hold to expiry."),
+    take_profit: float = typer.Option(None, help="Exit at this fractional gain; omit to hold to expiry."),
+    output: str = typer.Option("data/storage/outcomes", help="Directory for the per-day .npz matrices."),
+    heatmap: bool = typer.Option(True, help="Plot artifacts/outcome_heatmap.png from the saved days."),
+):
+    """
+    Computes the P&L of entering every contract at every minute, per day, for research.
+    """
+    outcomes_command(
+        symbol, start_time, end_time, stop_loss, take_profit, f"{output}/{symbol}", heatmap
+    )
+
+
+@app.command()
+def benchmark(
+    days: int = typer.Option(20, help="Trading days in the generated dataset."),
+    strikes: int = typer.Option(20, help="Strikes per day; each has a call and a put."),
+    minutes: int = typer.Option(390, help="Minute bars per day (at most 390)."),
+    seed: int = typer.Option(0, help="Random seed of the dataset."),
+    repeat: int = typer.Option(1, help="Timed runs per stage; the fastest counts."),
+    synthetic_days: int = typer.Option(1, help="Days of synthetic chain generation to time; 0 skips it."),
+    output: str = typer.Option("benchmarks/results.json", help="Where to write the results."),
+    baseline: str = typer.Option("benchmarks/baseline.json", help="Baseline results to compare with."),
+    update_baseline: bool = typer.Option(False, help="Store these results as the baseline."),
+    tolerance: float = typer.Option(0.2, help="Slowdown over the baseline reported as a regression."),
+    workdir: str = typer.Option(None, help="Keep the generated dataset here instead of a temp dir."),
+):
+    """
+    Times data loading, backtests, synthetic generation and analysis on a generated dataset.
+    """
+    if benchmark_command(
+        days,
+        strikes,
+        minutes,
+        seed,
+        repeat,
+        synthetic_days,
+        output,
+        baseline,
+        update_baseline,
+        tolerance,
+        workdir,
+    ):
+        raise typer.Exit(1)
+
+
+@app.command()
+def analysis(
+    symbol: str = "SPX",
+    profile: str = typer.Option(None, help=PROFILE_HELP),
+    daemon: str = typer.Option(None, help=DAEMON_HELP),
+):
     """
     Runs EOD activation/movement/expiry gain analysis for a given symbol.
     """
-    analysis_command(symbol)
+    if daemon:
+        if not submit(daemon, "analysis", {"symbol": symbol}, profile):
+            raise typer.Exit(1)
+        return
+    with profiling(profile):
+        analysis_command(symbol)
+
+
+@app.command()
+def daemon(socket: str = typer.Option(DEFAULT_SOCKET, help="Unix socket to listen on.")):
+    """
+    Keeps loaded data resident and runs backtest, analysis and synthetic-data jobs sent with --daemon.
+    """
+    serve(socket)
 
 
 if __name__ == "__main__":
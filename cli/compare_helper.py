@@ -0,0 +1,36 @@
+from typing import List
+
+from cli.backtest_helper import STRATEGIES
+from cli.sweep_helper import parse_value
+from constants import END_DT, START_DT
+from tester.multi import MultiBacktester
+
+
+def parse_variant(spec: str) -> dict:
+    """
+    Parses `name=value,name=value` into constructor keyword arguments.
+    """
+    params = {}
+    for pair in filter(None, spec.split(",")):
+        name, _, value = pair.partition("=")
+        params[name] = parse_value(value)
+    return params
+
+
+def compare_command(
+    symbol: str,
+    strategy_name: str,
+    variants: List[str],
+    prefilter: bool = True,
+):
+    if strategy_name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+
+    strategy_cls = STRATEGIES[strategy_name]
+    strategies = [
+        strategy_cls(symbol=symbol, **parse_variant(spec)) for spec in variants or [""]
+    ]
+
+    tester = MultiBacktester(strategies, prefilter=prefilter)
+    tester.run(start_date=START_DT, end_date=END_DT)
+    tester.summary()
@@ -0,0 +1,213 @@
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cli import backtest_helper
+from cli.analysis_helper import analysis_command
+from cli.data_helper import synthetic_data_command
+from data.data_handler import DataHandler
+from data.funcs import get_stock_symbol
+from data.metrics import profiling
+from data.options.process_0dte import BASE_DIR, SYNTHETIC_BASE_DIR, contract_files
+from data.stocks.process_stocks import BASE_DIR as STOCK_DIR
+
+DEFAULT_SOCKET = "/tmp/eodalgo.sock"
+
+# Per command: the job function and whether its data includes synthetic
+# contracts, as the command would load it itself.
+JOBS: Dict[str, Tuple[Callable[..., Any], bool]] = {
+    "backtest": (backtest_helper.backtest_command, True),
+    "analysis": (analysis_command, False),
+    "synthetic-data": (synthetic_data_command, False),
+}
+
+
+class _SocketStream:
+    """
+    File-like object forwarding writes to the client as JSON lines, so a
+    job's prints and progress bars show up in the submitting terminal.
+    """
+
+    def __init__(self, conn: socket.socket, name: str):
+        self.conn = conn
+        self.name = name
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self.conn, {self.name: text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _send(conn: socket.socket, message: dict):
+    conn.sendall((json.dumps(message) + "\n").encode())
+
+
+def storage_signature(symbol: str, include_synthetic: bool) -> List[Tuple[str, int, int]]:
+    """
+    Path, mtime and size of every file a DataHandler for `symbol` reads; any
+    change means the resident data is stale.
+    """
+    paths = contract_files(BASE_DIR, symbol)
+    if include_synthetic and SYNTHETIC_BASE_DIR.is_dir():
+        paths += contract_files(SYNTHETIC_BASE_DIR, symbol)
+    paths.append(STOCK_DIR / f"{get_stock_symbol(symbol)}.json")
+
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return signature
+
+
+class WarmData:
+    """
+    Prepared DataHandlers kept resident between jobs, one per symbol and
+    synthetic flag, reloaded when their files in storage change.
+    """
+
+    def __init__(self):
+        self.handlers: Dict[Tuple[str, bool], Tuple[list, DataHandler]] = {}
+
+    def get(self, symbol: str, include_synthetic: bool) -> DataHandler:
+        key = (symbol, include_synthetic)
+        signature = storage_signature(symbol, include_synthetic)
+        if key in self.handlers:
+            cached_signature, handler = self.handlers[key]
+            if cached_signature == signature:
+                print(f"Using resident data for {symbol}.")
+                return handler
+            print(f"Storage changed for {symbol}, reloading.")
+        handler = DataHandler(symbol, include_synthetic=include_synthetic)
+        self.handlers[key] = (signature, handler)
+        return handler
+
+
+def reload_strategies():
+    """
+    Re-imports the modules of the registered strategies, so edits to a
+    strategy take effect on the next job. Changes to BaseStrategy itself
+    need a daemon restart.
+    """
+    for name, cls in list(backtest_helper.STRATEGIES.items()):
+        module = importlib.reload(sys.modules[cls.__module__])
+        backtest_helper.STRATEGIES[name] = getattr(module, cls.__name__)
+
+
+def _run_job(job: dict, warm: WarmData):
+    command, args = job["command"], job["args"]
+    if command not in JOBS:
+        raise ValueError(f"Unknown daemon command: {command}")
+    if job["cwd"] != os.getcwd():
+        raise ValueError(
+            f"Daemon serves the storage under {os.getcwd()}; submit from there."
+        )
+    run, include_synthetic = JOBS[command]
+    if command == "backtest":
+        reload_strategies()
+    with profiling(job.get("profile")):
+        run(**args, data=warm.get(args["symbol"], include_synthetic))
+
+
+def serve(socket_path: str = DEFAULT_SOCKET):
+    """
+    Serves jobs on a Unix socket, one at a time, until interrupted.
+
+    A job is one JSON line naming the command and its arguments; the reply
+    streams the job's output as JSON lines and ends with `{"done": true}`.
+    """
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+            raise ValueError(f"A daemon is already listening on {socket_path}")
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(socket_path)  # Left behind by a daemon that died.
+        finally:
+            probe.close()
+
+    # Stop on SIGTERM as on Ctrl-C, removing the socket.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    warm = WarmData()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    print(f"Daemon listening on {socket_path}")
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                job = json.loads(conn.makefile("r").readline())
+                print(f"Running {job['command']} {job['args']}")
+                error = None
+                try:
+                    with redirect_stdout(_SocketStream(conn, "stdout")), redirect_stderr(
+                        _SocketStream(conn, "stderr")
+                    ):
+                        try:
+                            _run_job(job, warm)
+                        except Exception as e:
+                            traceback.print_exc()
+                            error = f"{type(e).__name__}: {e}"
+                    _send(conn, {"done": True, "error": error})
+                except (BrokenPipeError, ConnectionResetError):
+                    print("Client disconnected before the job finished.")
+                    continue
+                print(f"Finished {job['command']}" + (f" with {error}" if error else ""))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.remove(socket_path)
+
+
+def submit(
+    socket_path: str, command: str, args: Dict[str, Any], profile: Optional[str] = None
+) -> bool:
+    """
+    Runs a job on the daemon, echoing its output.
+
+    :return: Whether the job succeeded.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        raise ValueError(f"No daemon is listening on {socket_path}; start one with `daemon`.")
+
+    with client:
+        job = {
+            "command": command,
+            "args": args,
+            "profile": os.path.abspath(profile) if profile else None,
+            "cwd": os.getcwd(),
+        }
+        client.sendall((json.dumps(job) + "\n").encode())
+        for line in client.makefile("r"):
+            message = json.loads(line)
+            if "stdout" in message:
+                sys.stdout.write(message["stdout"])
+                sys.stdout.flush()
+            elif "stderr" in message:
+                sys.stderr.write(message["stderr"])
+                sys.stderr.flush()
+            elif message.get("done"):
+                if message["error"]:
+                    print(f"Daemon job failed: {message['error']}")
+                return not message["error"]
+    print("Daemon closed the connection before the job finished.")
+    return False
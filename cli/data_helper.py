@@ -0,0 +1,28 @@
+from typing import Optional
+
+from constants import END_DT, START_DT
+from data.api.polygon import PolygonAPI
+from data.data_handler import DataHandler
+from data.metrics import FetchMetrics
+from data.options.fetch_0dte import Fetch0DTE
+from data.options.synthetic_0dte import SyntheticDataGenerator
+
+
+def data_command(symbol, metrics_path=None, metrics_interval=30.0):
+    print(f"Pulling data for {symbol} from {START_DT} to {END_DT}")
+    api = PolygonAPI()
+    metrics = FetchMetrics(metrics_path, metrics_interval) if metrics_path else None
+    fetcher = Fetch0DTE(api, api, START_DT, END_DT, metrics=metrics)
+    contracts = fetcher.fetch_0dte_bars_agg(symbol)
+    print(f"Fetched {len(contracts)} contracts for {symbol}")
+
+def synthetic_data_command(symbol, data: Optional[DataHandler] = None):
+    print(f"Pulling synthetic data for {symbol} from {START_DT} to {END_DT}")
+    gen = SyntheticDataGenerator()
+    contracts = gen.generate_synthetic_data(symbol, data)
+    print(f"Fetched {len(contracts)} synthetic contracts for {symbol}")
+
+def synthetic_clean_command(symbol):
+    print(f"Cleaning synthetic data for {symbol}")
+    gen = SyntheticDataGenerator()
+    gen.clean_synthetic_data(symbol)
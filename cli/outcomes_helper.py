@@ -0,0 +1,34 @@
+from datetime import time
+from typing import Optional
+
+from analysis.outcomes import plot_outcome_heatmap
+from constants import END_DT, START_DT
+from data.data_handler import DataHandler
+from tester.backtester import get_trading_days
+from tester.outcomes import compute_outcomes, load_outcomes
+
+
+def outcomes_command(
+    symbol: str,
+    start_time: str,
+    end_time: str,
+    stop_loss: Optional[float],
+    take_profit: Optional[float],
+    output_dir: str,
+    heatmap: bool = True,
+):
+    data = DataHandler(symbol, include_synthetic=True)
+    compute_outcomes(
+        data,
+        get_trading_days(START_DT, END_DT),
+        time.fromisoformat(start_time),
+        time.fromisoformat(end_time),
+        stop_loss,
+        take_profit,
+        output_dir,
+    )
+    print(f"Saved outcome matrices to {output_dir}")
+
+    if heatmap:
+        print("→ Plotting outcome heatmap")
+        plot_outcome_heatmap(load_outcomes(output_dir, START_DT, END_DT))
@@ -0,0 +1,50 @@
+import asyncio
+import json
+from typing import Optional
+
+from constants import END_DT, START_DT
+from data.data_handler import DataHandler
+from tester.backtester import get_trading_days
+from tester.replay import ReplayTrader, bars_to_json, file_tail_feed, storage_feed
+from cli.backtest_helper import STRATEGIES
+
+
+async def _record(data: DataHandler, path: str, speed: float):
+    with open(path, "w") as f:
+        async for bars in storage_feed(data, get_trading_days(START_DT, END_DT), speed):
+            f.write(bars_to_json(bars) + "\n")
+            f.flush()
+        f.write(json.dumps({"end": True}) + "\n")
+
+
+def replay_command(
+    symbol: str,
+    strategy_name: str,
+    speed: float = 0.0,
+    budget: float = 1.0,
+    feed_file: Optional[str] = None,
+    record: Optional[str] = None,
+    idle_timeout: Optional[float] = None,
+    report_path: Optional[str] = None,
+):
+    if strategy_name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+    data = DataHandler(symbol, include_synthetic=True)
+
+    if record:
+        asyncio.run(_record(data, record, speed))
+        print(f"Recorded feed to {record}")
+        return
+
+    trader = ReplayTrader(STRATEGIES[strategy_name](symbol=symbol), data, budget)
+    if feed_file:
+        feed = file_tail_feed(feed_file, idle_timeout=idle_timeout)
+    else:
+        feed = storage_feed(data, get_trading_days(START_DT, END_DT), speed)
+    portfolio = asyncio.run(trader.run(feed))
+
+    trader.summary()
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(trader.latency_report(), f, indent=2)
+    portfolio.summary(trader.days)
@@ -0,0 +1,73 @@
+import json
+import os
+import socket
+from typing import List, Optional
+
+from cli.backtest_helper import STRATEGIES
+from cli.sweep_helper import build_configs
+from constants import END_DT, START_DT
+from tester.backtester import get_trading_days
+from tester.sharded import ShardQueue, merge, run_worker
+from tester.sweep import result_line
+
+
+def shard_init_command(
+    queue_path: str,
+    symbol: str,
+    strategy_name: str,
+    params: List[str],
+    samples: int,
+    seed: int,
+    days_per_unit: int,
+    engine: str,
+):
+    if strategy_name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+
+    configs = build_configs(params, samples, seed) if params else [{}]
+    units = ShardQueue(queue_path).create(
+        STRATEGIES[strategy_name],
+        symbol,
+        engine,
+        configs,
+        get_trading_days(START_DT, END_DT),
+        days_per_unit,
+        sweep=bool(params),
+    )
+    print(f"Queue {queue_path}: {len(units)} units for {len(configs)} configurations")
+
+
+def shard_worker_command(queue_path: str, worker: Optional[str], lease: float):
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    queue = ShardQueue(queue_path, lease)
+    completed = run_worker(queue, worker)
+    status = queue.status()
+    print(
+        f"Worker {worker} completed {completed} units; "
+        f"{status['done']} of {status['units']} done, {status['running']} running"
+    )
+
+
+def shard_merge_command(queue_path: str, output: str):
+    queue = ShardQueue(queue_path)
+    manifest = queue.manifest()
+    params = {u.config: u.params for u in manifest["units"]}
+    # Every config covers the same days.
+    days = sorted({day for u in manifest["units"] for day in u.days})
+    portfolios = merge(queue)
+
+    if not manifest["sweep"]:
+        portfolios[0].summary(days)
+        return
+
+    # Same JSON lines as the sweep command.
+    results = [{"params": params[c], **p.stats(days)} for c, p in portfolios.items()]
+    with open(output, "w") as out:
+        for result in results:
+            out.write(result_line(result) + "\n")
+
+    best = max(results, key=lambda r: r["total_pnl"])
+    print(
+        f"Best total P&L {best['total_pnl']:.2f} with {json.dumps(best['params'], default=str)}"
+    )
+    print(f"Results written to {output}")
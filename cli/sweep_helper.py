@@ -0,0 +1,113 @@
+import json
+import re
+from datetime import datetime
+from typing import Any, List
+
+from cli.backtest_helper import STRATEGIES
+from constants import END_DT, START_DT
+from tester.cache import DayResultCache
+from tester.sweep import ParameterSweep, grid_configs, random_configs
+from tester.walk_forward import WalkForward
+
+
+def parse_value(raw: str) -> Any:
+    if re.fullmatch(r"\d{1,2}:\d{2}", raw):
+        return datetime.strptime(raw, "%H:%M").time()
+    try:
+        return int(raw)
+    except ValueError:
+        return float(raw)
+
+
+def parse_space(params: List[str]) -> dict:
+    """
+    Parses `name=v1,v2,...` (discrete values) and `name=low..high` (uniform
+    interval, random search only) specifications.
+    """
+    space = {}
+    for spec in params:
+        name, _, values = spec.partition("=")
+        if ".." in values:
+            low, high = values.split("..")
+            space[name] = (float(low), float(high))
+        else:
+            space[name] = [parse_value(v) for v in values.split(",")]
+    return space
+
+
+def build_configs(params: List[str], samples: int, seed: int) -> List[dict]:
+    space = parse_space(params)
+    if samples:
+        return random_configs(space, samples, seed)
+    if any(isinstance(v, tuple) for v in space.values()):
+        raise ValueError("Interval parameters require --samples (random search).")
+    return grid_configs(space)
+
+
+def sweep_command(
+    symbol: str,
+    strategy_name: str,
+    params: List[str],
+    samples: int,
+    seed: int,
+    workers: int,
+    output: str,
+):
+    if strategy_name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+
+    configs = build_configs(params, samples, seed)
+
+    print(f"Sweeping {len(configs)} configurations of {strategy_name} on {symbol}")
+    sweep = ParameterSweep(
+        STRATEGIES[strategy_name], symbol, configs, output, workers=workers
+    )
+    results = sweep.run(start_date=START_DT, end_date=END_DT)
+
+    best = max(results, key=lambda r: r["total_pnl"], default=None)
+    if best is not None:
+        params = json.dumps(best["params"], default=str)
+        print(f"Best total P&L {best['total_pnl']:.2f} with {params}")
+    print(f"Results written to {output}")
+
+
+def walk_forward_command(
+    symbol: str,
+    strategy_name: str,
+    params: List[str],
+    samples: int,
+    seed: int,
+    in_sample_days: int,
+    out_of_sample_days: int,
+    step_days: int,
+    objective: str,
+    cache_dir: str,
+):
+    if strategy_name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+
+    configs = build_configs(params, samples, seed)
+    cache = DayResultCache(cache_dir)
+    walk = WalkForward(
+        STRATEGIES[strategy_name],
+        symbol,
+        configs,
+        in_sample_days=in_sample_days,
+        out_of_sample_days=out_of_sample_days,
+        step_days=step_days,
+        objective=objective,
+        cache=cache,
+    )
+    results = walk.run(start_date=START_DT, end_date=END_DT)
+
+    for r in results:
+        print(
+            f"IS {r.window.in_sample[0]}..{r.window.in_sample[-1]} "
+            f"{objective}={r.in_sample_score:.2f} | "
+            f"OOS {r.window.out_of_sample[0]}..{r.window.out_of_sample[-1]} "
+            f"P&L={r.out_of_sample['total_pnl']:.2f} | "
+            f"{json.dumps(r.params, default=str)}"
+        )
+    print(f"Day cache: {cache.hits} hits, {cache.misses} misses\n")
+
+    walk.out_of_sample_portfolio(results).summary(walk.out_of_sample_days(results))
@@ -1,11 +1,23 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
+from data.metrics import FetchMetrics
 from data.models import Candle, ContractType
 
 
 class BaseAPI(ABC):
+    metrics: Optional[FetchMetrics] = None
+
+    @property
+    def provider(self) -> str:
+        """
+        Provider label used when recording metrics (e.g. PolygonAPI -> "polygon").
+        """
+        return type(self).__name__.removesuffix("API").lower()
+
+    def attach_metrics(self, metrics: Optional[FetchMetrics]):
+        self.metrics = metrics
 
     @abstractmethod
     def get_option_contract_candles(
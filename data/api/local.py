@@ -0,0 +1,247 @@
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from constants import MARKET_CLOSE, MARKET_OPEN
+from data.api.base import BaseAPI
+from data.metrics import metered
+from data.models import Candle, ContractType
+
+OCC_PATTERN = re.compile(r"^O:(?P<root>[A-Z]+)(?P<date>\d{6})(?P<type>[CP])(?P<strike>\d{8})$")
+
+
+class RateLimitError(Exception):
+    """
+    Raised when the simulated provider rejects a request for exceeding its rate.
+    """
+
+
+class TransientAPIError(Exception):
+    """
+    Raised for simulated server-side failures that succeed when retried.
+    """
+
+
+@dataclass
+class FaultProfile:
+    """
+    Describes how a LocalAPI misbehaves.
+
+    :param latency_ms: Median request latency in milliseconds.
+    :param latency_sigma: Log-normal shape of the latency distribution (0 = fixed).
+    :param rate_limit_per_sec: Sustained requests per second before RateLimitError.
+    :param burst: Requests allowed in a burst above the sustained rate.
+    :param error_rate: Probability that a request raises TransientAPIError.
+    :param partial_page_rate: Probability that a response is truncated.
+    :param empty_rate: Probability that a response contains no candles.
+    """
+
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.0
+    rate_limit_per_sec: Optional[float] = None
+    burst: int = 5
+    error_rate: float = 0.0
+    partial_page_rate: float = 0.0
+    empty_rate: float = 0.0
+
+
+class LocalAPI(BaseAPI):
+    """
+    Offline stand-in for a market data provider.
+
+    Generates deterministic minute grids from a geometric Brownian motion
+    underlying and prices option contracts from it with Black-Scholes, while
+    injecting the latency, rate limits, failures and partial pages described
+    by its FaultProfile. Useful for load testing the fetch pipeline without
+    network access.
+    """
+
+    def __init__(
+        self,
+        profile: Optional[FaultProfile] = None,
+        base_price: float = 5900.0,
+        volatility: float = 0.15,
+        seed: int = 0,
+    ):
+        self.profile = profile or FaultProfile()
+        self.base_price = base_price
+        self.volatility = volatility
+        self.seed = seed
+        self.r = 0.05
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(self.profile.burst)
+        self._last_refill = time.monotonic()
+        self.request_count = 0
+
+    @metered("option_candles")
+    def get_option_contract_candles(
+        self, contract_symbol: str, from_dt: datetime, to_dt: datetime
+    ) -> List[Candle]:
+        self._simulate_request()
+
+        match = OCC_PATTERN.match(contract_symbol)
+        if match is None:
+            raise ValueError(f"Invalid OCC option symbol: {contract_symbol}")
+
+        expiry = datetime.strptime(match["date"], "%y%m%d").date()
+        strike = int(match["strike"]) / 1000
+        contract_type = ContractType.CALL if match["type"] == "C" else ContractType.PUT
+
+        candles = []
+        for dt in self._iter_days(from_dt, to_dt):
+            if dt > expiry:
+                break
+            candles.extend(
+                self._price_option(self._generate_day(dt), strike, contract_type, expiry)
+            )
+        return self._apply_page_faults(candles)
+
+    @metered("stock_candles")
+    def get_stock_candles(
+        self, symbol: str, from_dt: datetime, to_dt: datetime
+    ) -> List[Candle]:
+        self._simulate_request()
+
+        candles = []
+        for dt in self._iter_days(from_dt, to_dt):
+            candles.extend(self._generate_day(dt))
+        return self._apply_page_faults(candles)
+
+    def _iter_days(self, from_dt: datetime, to_dt: datetime):
+        from_day = from_dt.date() if isinstance(from_dt, datetime) else from_dt
+        to_day = to_dt.date() if isinstance(to_dt, datetime) else to_dt
+
+        dt = from_day
+        while dt <= to_day:
+            if dt.weekday() < 5:
+                yield dt
+            dt += timedelta(days=1)
+
+    def _generate_day(self, dt: date) -> List[Candle]:
+        """
+        Builds the underlying's minute candles for a trading day. The path only
+        depends on the seed and the day, so stocks and options agree.
+        """
+        rng = random.Random(zlib.crc32(f"{self.seed}:{dt.isoformat()}".encode()))
+        day_index = (dt - date(2000, 1, 1)).days
+        minute_vol = self.volatility / math.sqrt(252 * 390)
+
+        price = self.base_price * math.exp(0.0002 * math.sin(day_index))
+        ts = datetime.combine(dt, MARKET_OPEN, tzinfo=timezone.utc)
+        end = datetime.combine(dt, MARKET_CLOSE, tzinfo=timezone.utc)
+
+        candles = []
+        while ts <= end:
+            open_ = price
+            price = open_ * math.exp(rng.gauss(0.0, minute_vol))
+            wick = abs(rng.gauss(0.0, minute_vol)) * open_
+            candles.append(
+                Candle(
+                    open=open_,
+                    high=max(open_, price) + wick,
+                    low=min(open_, price) - wick,
+                    close=price,
+                    volume=float(rng.randint(0, 5000)),
+                    vwap=(open_ + price) / 2,
+                    timestamp=ts,
+                )
+            )
+            ts += timedelta(minutes=1)
+        return candles
+
+    def _price_option(
+        self,
+        stock_candles: List[Candle],
+        strike: float,
+        contract_type: ContractType,
+        expiry: date,
+    ) -> List[Candle]:
+        market_close = datetime.combine(expiry, MARKET_CLOSE, tzinfo=timezone.utc)
+
+        def price(s: float, ts: datetime) -> float:
+            minutes = max((market_close - ts).total_seconds() / 60, 0.0)
+            return round(
+                self._bs_price(s, strike, minutes / (390 * 252), contract_type), 2
+            )
+
+        candles = []
+        for c in stock_candles:
+            bounds = (price(c.low, c.timestamp), price(c.high, c.timestamp))
+            close = price(c.close, c.timestamp)
+            candles.append(
+                Candle(
+                    open=price(c.open, c.timestamp),
+                    high=max(bounds + (close,)),
+                    low=min(bounds + (close,)),
+                    close=close,
+                    volume=float(int(c.volume) % 97),
+                    vwap=close,
+                    timestamp=c.timestamp,
+                )
+            )
+        return candles
+
+    def _bs_price(
+        self, S: float, K: float, T: float, contract_type: ContractType
+    ) -> float:
+        if T <= 0:
+            return max(0.0, S - K) if contract_type == ContractType.CALL else max(0.0, K - S)
+
+        vol = self.volatility
+        d1 = (math.log(S / K) + (self.r + 0.5 * vol**2) * T) / (vol * math.sqrt(T))
+        d2 = d1 - vol * math.sqrt(T)
+
+        def cdf(x: float) -> float:
+            return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+        if contract_type == ContractType.CALL:
+            return S * cdf(d1) - math.exp(-self.r * T) * K * cdf(d2)
+        return math.exp(-self.r * T) * K * cdf(-d2) - S * cdf(-d1)
+
+    def _simulate_request(self):
+        """
+        Applies latency, rate limiting and transient failures to a request.
+        """
+        profile = self.profile
+
+        with self._lock:
+            self.request_count += 1
+            latency = profile.latency_ms / 1000
+            if latency and profile.latency_sigma:
+                latency *= self._rng.lognormvariate(0.0, profile.latency_sigma)
+            fail = self._rng.random() < profile.error_rate
+
+            if profile.rate_limit_per_sec is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(profile.burst),
+                    self._tokens + (now - self._last_refill) * profile.rate_limit_per_sec,
+                )
+                self._last_refill = now
+                if self._tokens < 1:
+                    raise RateLimitError("429 Too Many Requests")
+                self._tokens -= 1
+
+        if latency:
+            time.sleep(latency)
+        if fail:
+            raise TransientAPIError("503 Service Unavailable")
+
+    def _apply_page_faults(self, candles: List[Candle]) -> List[Candle]:
+        with self._lock:
+            roll = self._rng.random()
+            cut = self._rng.randint(0, max(len(candles) - 1, 0))
+
+        if roll < self.profile.empty_rate:
+            return []
+        if roll < self.profile.empty_rate + self.profile.partial_page_rate:
+            return candles[:cut]
+        return candles
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List
 from data.api.base import BaseAPI
+from data.metrics import metered
 from data.models import Candle
 
 
@@ -9,6 +10,7 @@ class MockAPI(BaseAPI):
     Mock implementation of BaseAPI for testing purposes.
     """
 
+    @metered("option_candles")
     def get_option_contract_candles(
         self, contract_symbol: str, from_dt: datetime, to_dt: datetime
     ) -> List[Candle]:
@@ -34,6 +36,7 @@ class MockAPI(BaseAPI):
             for _ in range(10)  # Return 10 mock candles
         ]
 
+    @metered("stock_candles")
     def get_stock_candles(
         self, symbol: str, from_dt: datetime, to_dt: datetime) -> List[Candle]:
         """"
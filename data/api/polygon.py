@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import List
 from polygon import RESTClient
 from data.api.base import BaseAPI
+from data.metrics import metered, time_stage
 from data.models import Candle
 import arrow
 import os
@@ -29,36 +30,40 @@ class PolygonAPI(BaseAPI):
         return dt.strftime("%Y-%m-%d")
 
     def get_agg(self, symbol, from_dt, to_dt, limit) -> List[Candle]:
-        list_dt = list(
-            self.client.list_aggs(
-                symbol,
-                1,
-                "minute",
-                self.convert_dt(from_dt),
-                self.convert_dt(to_dt),
-                adjusted="true",
-                sort="asc",
-                limit=limit,
+        with time_stage(self.metrics, "request"):
+            list_dt = list(
+                self.client.list_aggs(
+                    symbol,
+                    1,
+                    "minute",
+                    self.convert_dt(from_dt),
+                    self.convert_dt(to_dt),
+                    adjusted="true",
+                    sort="asc",
+                    limit=limit,
+                )
             )
-        )
-        return [
-            Candle(
-                open=candle.open,
-                high=candle.high,
-                low=candle.low,
-                close=candle.close,
-                volume=candle.volume,
-                vwap=candle.vwap,
-                timestamp=arrow.get(candle.timestamp).datetime,
-            )
-            for candle in list_dt
-        ]
+        with time_stage(self.metrics, "parse"):
+            return [
+                Candle(
+                    open=candle.open,
+                    high=candle.high,
+                    low=candle.low,
+                    close=candle.close,
+                    volume=candle.volume,
+                    vwap=candle.vwap,
+                    timestamp=arrow.get(candle.timestamp).datetime,
+                )
+                for candle in list_dt
+            ]
 
+    @metered("option_candles")
     def get_option_contract_candles(
         self, contract_symbol: str, from_dt: datetime, to_dt: datetime
     ) -> List[Candle]:
         return self.get_agg(contract_symbol, from_dt, to_dt, 390)
 
+    @metered("stock_candles")
     def get_stock_candles(
         self, symbol: str, from_dt: datetime, to_dt: datetime
     ) -> List[Candle]:
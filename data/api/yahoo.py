@@ -3,6 +3,7 @@ from typing import List
 
 import pandas as pd
 from data.api.base import BaseAPI
+from data.metrics import metered
 from data.models import Candle
 import yfinance as yf
 
@@ -15,6 +16,7 @@ class YahooAPI(BaseAPI):
     def __init__(self):
         super().__init__()
 
+    @metered("option_candles")
     def get_option_contract_candles(
         self, contract_symbol: str, from_dt: datetime, to_dt: datetime
     ) -> List[Candle]:
@@ -22,6 +24,7 @@ class YahooAPI(BaseAPI):
             "Yahoo Finance API does not support fetching option contract candles directly."
         )
 
+    @metered("stock_candles")
     def get_stock_candles(
         self, symbol: str, from_dt: datetime, to_dt: datetime
     ) -> List[Candle]:
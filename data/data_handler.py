@@ -1,11 +1,15 @@
+import bisect
+import hashlib
 from collections import defaultdict
 from datetime import date, time, datetime, timezone
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+import numpy as np
 import pandas as pd
 from pandera.typing import DataFrame
 
 from data.funcs import get_stock_symbol
+from data.metrics import profile_stage, profiled
 from data.models import Candle, Contract
 from data.options.process_0dte import load_contracts_from_json
 from data.stocks.process_stocks import load_stock_from_json
@@ -13,7 +17,14 @@ from constants import MARKET_OPEN, MARKET_CLOSE
 from tester.models import CandleModel
 
 
+class MissingDataError(Exception):
+    """
+    Raised when nothing is stored for a symbol, e.g. before its first fetch.
+    """
+
+
 class DataHandler:
+    @profiled("data_handler_init")
     def __init__(self, symbol: str, include_synthetic: bool = False):
         self.symbol = symbol
         print(f"Loading data for {symbol}...")
@@ -22,10 +33,15 @@ class DataHandler:
                 load_contracts_from_json(symbol, include_synthetic)
             )
         )
-        self.option_candles_by_symbol = self._index_option_candles()
+        self.raw_option_candles: Dict[str, List[Candle]] = self._index_option_candles()
+        # Option frames are built on first use, so days that are never
+        # simulated never pay for framing and validation.
+        self.option_candles_by_symbol: Dict[str, DataFrame[CandleModel]] = dict()
+        self.day_fingerprints: Dict[str, str] = dict()
         self.stock_candles_dt_df: Dict[str, DataFrame[CandleModel]] = (
             self._index_stock_candles()
         )
+        self.stock_days: List[str] = sorted(self.stock_candles_dt_df)
         print(f"Data loaded for {symbol} with {len(self.contracts_by_date)} dates.")
 
     def parse_dt(self, dt: date) -> str:
@@ -36,6 +52,8 @@ class DataHandler:
 
     def _load_and_validate_stock_data(self) -> DataFrame[CandleModel]:
         raw_candles: List[Candle] = load_stock_from_json(get_stock_symbol(self.symbol))
+        if not raw_candles:
+            raise MissingDataError(f"No stock data stored for {self.symbol}")
         return self._prepare_candle_df(raw_candles)
 
     def _index_contracts_by_date(
@@ -47,25 +65,30 @@ class DataHandler:
             contracts_by_date[expiry].append(c)
         return contracts_by_date
 
-    def _index_option_candles(self) -> Dict[str, DataFrame[CandleModel]]:
+    def _index_option_candles(self) -> Dict[str, List[Candle]]:
         option_candles_by_symbol: Dict[str, List[Candle]] = dict()
 
         for contract_list in self.contracts_by_date.values():
             for c in contract_list:
                 option_candles_by_symbol[c.symbol] = c.data
 
-        return {
-            symbol: self._prepare_candle_df(candles)
-            for symbol, candles in option_candles_by_symbol.items()
-        }
+        return option_candles_by_symbol
+
+    def _option_frame(self, symbol: str) -> DataFrame[CandleModel]:
+        if symbol not in self.option_candles_by_symbol:
+            self.option_candles_by_symbol[symbol] = self._prepare_candle_df(
+                self.raw_option_candles[symbol]
+            )
+        return self.option_candles_by_symbol[symbol]
 
     def _index_stock_candles(self) -> Dict[str, DataFrame[CandleModel]]:
         stock_candles = self._load_and_validate_stock_data()
         return {self.parse_dt(dt): df for dt, df in stock_candles.groupby("date")}
 
     def _prepare_candle_df(self, candles: List[Candle]) -> DataFrame[CandleModel]:
+        # Extends a copy, so the raw candles (and their fingerprints) are unchanged.
         if MARKET_CLOSE not in {c.timestamp.time() for c in candles}:
-            candles.append(
+            candles = candles + [
                 Candle(
                     open=candles[-1].open,
                     high=candles[-1].high,
@@ -77,36 +100,187 @@ class DataHandler:
                         candles[-1].timestamp.date(), MARKET_CLOSE
                     ),
                 )
-            )
+            ]
 
-        df = pd.DataFrame([vars(c) for c in candles])
-        df = df.sort_values("timestamp")
-        df["date"] = df["timestamp"].dt.date
-        df.ffill(inplace=True)
-        CandleModel.validate(df)
+        with profile_stage("candle_framing"):
+            df = pd.DataFrame([vars(c) for c in candles])
+            df = df.sort_values("timestamp")
+            df["date"] = df["timestamp"].dt.date
+            df.ffill(inplace=True)
+        with profile_stage("pandera_validation"):
+            CandleModel.validate(df)
         return df
 
+    def subset(self, days: List[date], history_days: int = 0) -> "DataHandler":
+        """
+        Returns a handler holding only the given days' contracts and candles,
+        small enough to ship to a worker process. With `history_days`, it also
+        keeps the stock candles of every stored day from that many days before
+        the first one to the last, for strategies looking back across days.
+        """
+        keys = [self.parse_dt(dt) for dt in days]
+        stock_keys = keys
+        if history_days and keys:
+            lo = max(bisect.bisect_left(self.stock_days, min(keys)) - history_days, 0)
+            hi = bisect.bisect_right(self.stock_days, max(keys))
+            stock_keys = self.stock_days[lo:hi]
+
+        handler = DataHandler.__new__(DataHandler)
+        handler.symbol = self.symbol
+        handler.contracts_by_date = {
+            k: self.contracts_by_date[k] for k in keys if k in self.contracts_by_date
+        }
+        symbols = {
+            c.symbol
+            for contracts in handler.contracts_by_date.values()
+            for c in contracts
+        }
+        handler.raw_option_candles = {s: self.raw_option_candles[s] for s in symbols}
+        handler.option_candles_by_symbol = {
+            s: self.option_candles_by_symbol[s]
+            for s in symbols
+            if s in self.option_candles_by_symbol
+        }
+        handler.day_fingerprints = {
+            k: self.day_fingerprints[k] for k in keys if k in self.day_fingerprints
+        }
+        handler.stock_candles_dt_df = {
+            k: self.stock_candles_dt_df[k]
+            for k in stock_keys
+            if k in self.stock_candles_dt_df
+        }
+        handler.stock_days = sorted(handler.stock_candles_dt_df)
+        return handler
+
+    def prior_days(self, dt: date, count: int) -> List[date]:
+        """
+        The last `count` days before `dt` with stock data, oldest first.
+        """
+        if count <= 0:
+            return []
+        i = bisect.bisect_left(self.stock_days, self.parse_dt(dt))
+        return [date.fromisoformat(k) for k in self.stock_days[max(i - count, 0) : i]]
+
+    def day_summary(self, days: List[date], start: time = MARKET_OPEN) -> pd.DataFrame:
+        """
+        One row per day with the stock's session open, high, low and close,
+        and `max_premium`, the highest option close in the chain from `start`
+        to MARKET_CLOSE. Built from the raw candles, without framing any
+        option chain. Days without stock data are left out.
+        """
+        keys = [
+            k for k in map(self.parse_dt, days) if k in self.stock_candles_dt_df
+        ]
+        if not keys:
+            return pd.DataFrame(
+                columns=["open", "high", "low", "close", "max_premium"],
+                index=pd.Index([], name="date"),
+            )
+
+        stock = pd.concat([self.stock_candles_dt_df[k] for k in keys])
+        times = stock["timestamp"].dt.time
+        stock = stock[(times >= MARKET_OPEN) & (times <= MARKET_CLOSE)]
+        summary = stock.groupby("date").agg(
+            open=("open", "first"),
+            high=("high", "max"),
+            low=("low", "min"),
+            close=("close", "last"),
+        )
+
+        summary["max_premium"] = [
+            max(
+                (
+                    self._max_close(self.raw_option_candles[c.symbol], start)
+                    for c in self.get_contracts_for_date(dt)
+                ),
+                default=0.0,
+            )
+            for dt in summary.index
+        ]
+        return summary
+
+    def _max_close(self, candles: List[Candle], start: time) -> float:
+        closes = [
+            c.close for c in candles if start <= c.timestamp.time() <= MARKET_CLOSE
+        ]
+        # _prepare_candle_df stamps a copy of the last bar at MARKET_CLOSE.
+        if candles and MARKET_CLOSE not in {c.timestamp.time() for c in candles}:
+            closes.append(candles[-1].close)
+        return max(closes, default=0.0)
+
+    def day_fingerprint(self, dt: date) -> str:
+        """
+        Digest of everything a backtest of `dt` reads: the day's stock candles
+        and its contracts with their candles.
+        """
+        key = self.parse_dt(dt)
+        if key not in self.day_fingerprints:
+            digest = hashlib.sha1()
+            stock = self.stock_candles_dt_df.get(key)
+            if stock is not None:
+                digest.update(pd.util.hash_pandas_object(stock, index=False).values.tobytes())
+            for c in sorted(self.get_contracts_for_date(dt), key=lambda c: c.symbol):
+                digest.update(f"{c.symbol}|{c.strike}|{c.contract_type.value}".encode())
+                digest.update(
+                    np.array(
+                        [
+                            (
+                                candle.open,
+                                candle.high,
+                                candle.low,
+                                candle.close,
+                                candle.volume,
+                                candle.vwap,
+                                candle.timestamp.timestamp(),
+                            )
+                            for candle in self.raw_option_candles[c.symbol]
+                        ],
+                        dtype=float,
+                    ).tobytes()
+                )
+            self.day_fingerprints[key] = digest.hexdigest()
+        return self.day_fingerprints[key]
+
     def get_contracts_for_date(self, dt: date) -> List[Contract]:
         return self.contracts_by_date.get(self.parse_dt(dt), [])
 
-    def get_option_candles(self, symbol: str) -> DataFrame[CandleModel]:
-        return self.process_candles(self.option_candles_by_symbol[symbol])
+    def get_option_candles(
+        self, symbol: str, start: Optional[time] = None
+    ) -> DataFrame[CandleModel]:
+        return self.process_candles(self._option_frame(symbol), start)
 
-    def get_stock_candles(self, dt: date) -> DataFrame[CandleModel]:
-        return self.process_candles(self.stock_candles_dt_df[self.parse_dt(dt)])
+    def get_stock_candles(
+        self, dt: date, start: Optional[time] = None
+    ) -> DataFrame[CandleModel]:
+        return self.process_candles(self.stock_candles_dt_df[self.parse_dt(dt)], start)
 
+    @profiled("process_candles")
     def process_candles(
-        self, candles: DataFrame[CandleModel]
+        self, candles: DataFrame[CandleModel], start: Optional[time] = None
     ) -> DataFrame[CandleModel]:
+        """
+        Returns one candle per minute from `start` (default MARKET_OPEN) to
+        MARKET_CLOSE, back-filling gaps. The frame starts at the last bar at or
+        before `start`, so it is the tail of the full-session frame and still
+        holds the latest bar as of any minute after `start`.
+        """
         candles = candles[
             (candles["timestamp"].dt.time <= MARKET_CLOSE)
             & (candles["timestamp"].dt.time >= MARKET_OPEN)
         ]
+        if start is not None and start > MARKET_OPEN:
+            times = candles["timestamp"].dt.time
+            earlier = candles["timestamp"][times <= start]
+            if not earlier.empty:
+                start = earlier.iloc[-1].time()
+            candles = candles[times >= start]
+        else:
+            start = MARKET_OPEN
         candles = candles.set_index("timestamp", drop=False)
         dt = candles["date"].iloc[-1]
         candles = candles.reindex(
             pd.date_range(
-                start=self._get_tz_aware_datetime(dt, MARKET_OPEN),
+                start=self._get_tz_aware_datetime(dt, start),
                 end=self._get_tz_aware_datetime(dt, MARKET_CLOSE),
                 freq="1min",
             ),
@@ -2,7 +2,19 @@ INDEX_DT = {
     "SPX": {
         "option_symbol": "SPXW",
         "stock_symbol": "^SPX",
-    }
+    },
+    "SPY": {
+        "option_symbol": "SPY",
+        "stock_symbol": "SPY",
+    },
+    "QQQ": {
+        "option_symbol": "QQQ",
+        "stock_symbol": "QQQ",
+    },
+    "IWM": {
+        "option_symbol": "IWM",
+        "stock_symbol": "IWM",
+    },
 }
 
 
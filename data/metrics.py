@@ -0,0 +1,377 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROFILE_BUCKETS = (
+    1e-6, 1e-5, 5e-5, 1e-4, 5e-4, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0
+)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram compatible with the Prometheus exposition format.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class FetchMetrics:
+    """
+    Collects per-provider request statistics and per-stage timings for the
+    data fetch pipeline, and writes them as a Prometheus text file or a JSON
+    snapshot (chosen by the file extension of `path`).
+    """
+
+    def __init__(self, path: Optional[str] = None, interval: float = 30.0):
+        self.path = path
+        self.interval = interval
+        self.started = time.monotonic()
+        self._last_write = self.started
+        self._lock = threading.Lock()
+
+        self.requests: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.empty: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.candles: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.payload_bytes: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.stages: Dict[str, Histogram] = defaultdict(Histogram)
+
+    def record_request(
+        self,
+        provider: str,
+        endpoint: str,
+        latency: float,
+        candles: int = 0,
+        payload_bytes: int = 0,
+        error: bool = False,
+    ):
+        key = (provider, endpoint)
+        with self._lock:
+            self.requests[key] += 1
+            self.latency[key].observe(latency)
+            if error:
+                self.errors[key] += 1
+                return
+            self.candles[key] += candles
+            self.payload_bytes[key] += payload_bytes
+            if not candles:
+                self.empty[key] += 1
+
+    def record_retry(self, provider: str):
+        with self._lock:
+            self.retries[provider] += 1
+
+    def record_stage(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage].observe(seconds)
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            providers = defaultdict(dict)
+            for (provider, endpoint), count in self.requests.items():
+                key = (provider, endpoint)
+                providers[provider][endpoint] = {
+                    "requests": count,
+                    "errors": self.errors[key],
+                    "empty_results": self.empty[key],
+                    "candles": self.candles[key],
+                    "payload_bytes": self.payload_bytes[key],
+                    "requests_per_second": count / elapsed if elapsed else 0.0,
+                    "latency_seconds": self.latency[key].to_dict(),
+                }
+            return {
+                "elapsed_seconds": elapsed,
+                "providers": dict(providers),
+                "retries": dict(self.retries),
+                "stages": {s: h.to_dict() for s, h in self.stages.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP eod_fetch_{name} {help_text}")
+            lines.append(f"# TYPE eod_fetch_{name} {kind}")
+
+        def labels(**kwargs) -> str:
+            return ",".join(f'{k}="{v}"' for k, v in kwargs.items())
+
+        per_endpoint = [
+            ("requests_total", "requests", "API requests issued."),
+            ("errors_total", "errors", "API requests that raised."),
+            ("empty_results_total", "empty_results", "Requests that returned no candles."),
+            ("candles_total", "candles", "Candles returned."),
+            ("payload_bytes_total", "payload_bytes", "Serialized size of returned candles."),
+        ]
+        for name, field, help_text in per_endpoint:
+            metric(name, "counter", help_text)
+            for provider, endpoints in snapshot["providers"].items():
+                for endpoint, stats in endpoints.items():
+                    lines.append(
+                        f"eod_fetch_{name}{{{labels(provider=provider, endpoint=endpoint)}}} {stats[field]}"
+                    )
+
+        metric("requests_per_second", "gauge", "Average request throughput.")
+        for provider, endpoints in snapshot["providers"].items():
+            for endpoint, stats in endpoints.items():
+                lines.append(
+                    f"eod_fetch_requests_per_second{{{labels(provider=provider, endpoint=endpoint)}}} "
+                    f"{stats['requests_per_second']:.6f}"
+                )
+
+        metric("request_latency_seconds", "histogram", "API request latency.")
+        for provider, endpoints in snapshot["providers"].items():
+            for endpoint, stats in endpoints.items():
+                self._histogram_lines(
+                    lines,
+                    "request_latency_seconds",
+                    labels(provider=provider, endpoint=endpoint),
+                    stats["latency_seconds"],
+                )
+
+        metric("retries_total", "counter", "Retried API calls.")
+        for provider, count in snapshot["retries"].items():
+            lines.append(f"eod_fetch_retries_total{{{labels(provider=provider)}}} {count}")
+
+        metric("stage_seconds", "histogram", "Wall time per pipeline stage.")
+        for stage, hist in snapshot["stages"].items():
+            self._histogram_lines(lines, "stage_seconds", labels(stage=stage), hist)
+
+        return "\n".join(lines) + "\n"
+
+    def _histogram_lines(self, lines: List[str], name: str, label_str: str, hist: dict):
+        for bound, count in hist["buckets"].items():
+            lines.append(f'eod_fetch_{name}_bucket{{{label_str},le="{bound}"}} {count}')
+        lines.append(f"eod_fetch_{name}_sum{{{label_str}}} {hist['sum']}")
+        lines.append(f"eod_fetch_{name}_count{{{label_str}}} {hist['count']}")
+
+    def write(self, path: Optional[str] = None):
+        path = path or self.path
+        if path is None:
+            return
+
+        if path.endswith(".json"):
+            content = json.dumps(self.snapshot(), indent=2)
+        else:
+            content = self.to_prometheus()
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self._last_write = time.monotonic()
+
+    def maybe_write(self):
+        """
+        Writes a snapshot if more than `interval` seconds passed since the last one.
+        """
+        if time.monotonic() - self._last_write >= self.interval:
+            self.write()
+
+
+class Profiler:
+    """
+    Wall time and call counts per named stage, for `--profile` runs.
+
+    The hooks (`profiled`, `profile_stage`) stay in the code: while the
+    profiler is disabled they cost a flag check per call. Stage times are
+    inclusive, so a stage that calls another is charged for both.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.stages: Dict[str, Histogram] = defaultdict(lambda: Histogram(PROFILE_BUCKETS))
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+        self.started = time.perf_counter()
+        self.stages.clear()
+
+    def disable(self):
+        self.enabled = False
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage].observe(seconds)
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "wall_seconds": time.perf_counter() - self.started,
+                "stages": {
+                    stage: {
+                        "calls": h.count,
+                        "total_seconds": h.sum,
+                        "mean_seconds": h.sum / h.count if h.count else 0.0,
+                        "histogram": dict(h.cumulative()),
+                    }
+                    for stage, h in sorted(self.stages.items())
+                },
+            }
+
+    def summary(self):
+        report = self.report()
+        print(f"Profile: {report['wall_seconds']:.2f}s wall")
+        stages = sorted(
+            report["stages"].items(), key=lambda s: s[1]["total_seconds"], reverse=True
+        )
+        for stage, stats in stages:
+            print(
+                f"  {stage:<28} {stats['total_seconds']:>9.3f}s "
+                f"{stats['calls']:>9} calls {stats['mean_seconds'] * 1e6:>11.1f} us/call"
+            )
+
+    def write(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(tmp_path, path)
+
+
+PROFILER = Profiler()
+
+
+def profiled(stage: str):
+    """
+    Decorates a function so its calls are recorded under `stage` while the
+    profiler is enabled.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(stage, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def profile_stage(stage: str):
+    if not PROFILER.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PROFILER.record(stage, time.perf_counter() - start)
+
+
+@contextmanager
+def profiling(path: Optional[str]):
+    """
+    Profiles the enclosed block if `path` is given, then prints the report
+    and writes it to `path`. The profiler is off again afterwards, so later
+    jobs in the same process (e.g. the daemon's) are not profiled.
+    """
+    if path is None:
+        yield
+        return
+    PROFILER.enable()
+    try:
+        yield
+    finally:
+        PROFILER.disable()
+        PROFILER.summary()
+        PROFILER.write(path)
+
+
+@contextmanager
+def time_stage(metrics: Optional[FetchMetrics], stage: str):
+    if metrics is None:
+        yield
+        return
+    with metrics.time_stage(stage):
+        yield
+
+
+def metered(endpoint: str):
+    """
+    Decorates a BaseAPI method so calls are recorded in the API's metrics.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            metrics: Optional[FetchMetrics] = getattr(self, "metrics", None)
+            if metrics is None:
+                return func(self, *args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                candles = func(self, *args, **kwargs)
+            except Exception:
+                metrics.record_request(
+                    self.provider, endpoint, time.perf_counter() - start, error=True
+                )
+                raise
+
+            metrics.record_request(
+                self.provider,
+                endpoint,
+                time.perf_counter() - start,
+                candles=len(candles),
+                payload_bytes=_payload_size(candles),
+            )
+            return candles
+
+        return wrapper
+
+    return decorator
+
+
+def _payload_size(candles) -> int:
+    # Approximates the stored JSON size without serializing the response.
+    return sum(len(repr(vars(c))) for c in candles)
@@ -1,8 +1,9 @@
 from datetime import date, datetime
 import math
-from typing import Dict, List
+from typing import Dict, List, Optional
 from data.api.base import BaseAPI
 from data.funcs import get_option_symbol, get_stock_symbol
+from data.metrics import FetchMetrics, time_stage
 from data.options.process_0dte import load_contracts_from_json, save_contracts_as_json
 from data.stocks.process_stocks import ProcessStocks
 from data.models import Candle, Contract, ContractType
@@ -17,13 +18,22 @@ class Fetch0DTE:
     """
 
     def __init__(
-        self, options_api: BaseAPI, stocks_api: BaseAPI, start_dt: date, end_dt: date
+        self,
+        options_api: BaseAPI,
+        stocks_api: BaseAPI,
+        start_dt: date,
+        end_dt: date,
+        metrics: Optional[FetchMetrics] = None,
     ):
         self.start_dt = start_dt
         self.end_dt = end_dt
         self.options_api = options_api
         self.stocks_process = ProcessStocks(stocks_api)
 
+        self.metrics = metrics
+        options_api.attach_metrics(metrics)
+        stocks_api.attach_metrics(metrics)
+
         self.open_market_days = list(
             self.parse_dt(dt)
             for dt in mcal.get_calendar("NYSE")
@@ -40,7 +50,7 @@ class Fetch0DTE:
         self.existing_contracts = dict()
 
     def set_existing_contracts(self, symbol: str):
-        contracts = load_contracts_from_json(get_option_symbol(symbol))
+        contracts = load_contracts_from_json(symbol)
         self.existing_contracts = {contract.symbol: contract for contract in contracts}
 
     def parse_dt_str(self, dt_str: str) -> datetime:
@@ -71,6 +81,8 @@ class Fetch0DTE:
                 return func(*args, **kwargs)
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed: {e}")
+                if self.metrics is not None and attempt < max_retries - 1:
+                    self.metrics.record_retry(self.options_api.provider)
                 time.sleep(self.def_wait_time)
                 if attempt < max_retries - 1:
                     continue
@@ -151,26 +163,34 @@ class Fetch0DTE:
         contracts = []
         contract_types = [ContractType.CALL, ContractType.PUT]
 
-        stock_candles = self.stocks_process.fetch_stocks(
-            symbol=get_stock_symbol(symbol),
-            from_dt=self.start_dt,
-            to_dt=self.end_dt,
-        )
-        self.set_existing_contracts(symbol)
+        with time_stage(self.metrics, "stocks"):
+            stock_candles = self.stocks_process.fetch_stocks(
+                symbol=get_stock_symbol(symbol),
+                from_dt=self.start_dt,
+                to_dt=self.end_dt,
+            )
+        with time_stage(self.metrics, "load_existing"):
+            self.set_existing_contracts(symbol)
 
         for dt in tqdm(self.open_market_days, desc=f"Processing {symbol}"):
             dt = self.parse_dt_str(dt)
             contract_strikes = self.fetch_0dte_strikes(stock_candles, dt)
             for contract_type in contract_types:
                 for strike in contract_strikes[contract_type]:
-                    contracts.append(
-                        self.fetch_0dte_bars(
-                            symbol,
-                            strike,
-                            contract_type,
-                            dt,
+                    with time_stage(self.metrics, "options"):
+                        contracts.append(
+                            self.fetch_0dte_bars(
+                                symbol,
+                                strike,
+                                contract_type,
+                                dt,
+                            )
                         )
-                    )
+            if self.metrics is not None:
+                self.metrics.maybe_write()
 
-        save_contracts_as_json(contracts)
+        with time_stage(self.metrics, "save"):
+            save_contracts_as_json(contracts, symbol)
+        if self.metrics is not None:
+            self.metrics.write()
         return contracts
@@ -1,10 +1,13 @@
 from enum import Enum
 import os
 import json
+import re
 from dataclasses import asdict
 from datetime import datetime
 from typing import List
 from pathlib import Path
+from data.funcs import get_option_symbol
+from data.metrics import profiled
 from data.models import Candle, Contract, ContractType
 
 BASE_DIR = Path("data/storage/options")
@@ -22,10 +25,71 @@ class EnhancedJSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def contracts_dir(base_dir: Path, symbol: str) -> Path:
+    """
+    Per-underlying namespace inside a contract storage directory.
+    """
+    return base_dir / symbol
+
+
+def contract_files(base_dir: Path, symbol: str) -> List[Path]:
+    """
+    Contract files of `symbol` under `base_dir`: its namespace first, then any
+    files of its option root left in the flat legacy layout. A contract stored
+    in both places is only listed from the namespace.
+    """
+    root = re.compile(rf"^O:{re.escape(get_option_symbol(symbol))}\d{{6}}[CP]")
+    files = {}
+
+    namespace = contracts_dir(base_dir, symbol)
+    if namespace.is_dir():
+        for path in sorted(namespace.iterdir()):
+            if path.suffix == ".json":
+                files[path.name] = path
+
+    for path in sorted(base_dir.iterdir()):
+        if path.suffix == ".json" and root.match(path.name):
+            files.setdefault(path.name, path)
+
+    return list(files.values())
+
+
+@profiled("json_load")
+def load_contract(file_path: Path) -> Contract:
+    with open(file_path, "r") as f:
+        raw = json.load(f)
+
+    candles = [
+        Candle(
+            open=c["open"],
+            high=c["high"],
+            low=c["low"],
+            close=c["close"],
+            volume=c["volume"],
+            vwap=c["vwap"],
+            timestamp=datetime.fromisoformat(c["timestamp"]),
+        )
+        for c in raw["data"]
+    ]
+
+    return Contract(
+        symbol=raw["symbol"],
+        underlying_symbol=raw["underlying_symbol"],
+        expiry=datetime.fromisoformat(raw["expiry"]),
+        strike=raw["strike"],
+        contract_type=ContractType(raw["contract_type"]),
+        data=candles,
+    )
+
+
 # Function to save each Contract as a separate data.json file
-def save_contracts_as_json(contracts: List[Contract]):
+def save_contracts_as_json(
+    contracts: List[Contract], symbol: str, base_dir: Path = BASE_DIR
+):
+    namespace = contracts_dir(base_dir, symbol)
+    os.makedirs(namespace, exist_ok=True)
     for contract in contracts:
-        file_path = os.path.join(BASE_DIR, f"{contract.symbol}.json")
+        file_path = os.path.join(namespace, f"{contract.symbol}.json")
         with open(file_path, "w") as f:
             json.dump(asdict(contract), f, cls=EnhancedJSONEncoder, indent=2)
 
@@ -41,37 +105,7 @@ def load_contracts_from_json(
             print(f"Directory {base_dir} does not exist. Skipping.")
             continue
 
-        for file_name in os.listdir(base_dir):
-            if not file_name.endswith(".json") or not symbol in file_name:
-                continue
-
-            file_path = os.path.join(base_dir, file_name)
-
-            with open(file_path, "r") as f:
-                raw = json.load(f)
-
-            candles = [
-                Candle(
-                    open=c["open"],
-                    high=c["high"],
-                    low=c["low"],
-                    close=c["close"],
-                    volume=c["volume"],
-                    vwap=c["vwap"],
-                    timestamp=datetime.fromisoformat(c["timestamp"]),
-                )
-                for c in raw["data"]
-            ]
-
-            contract = Contract(
-                symbol=raw["symbol"],
-                underlying_symbol=raw["underlying_symbol"],
-                expiry=datetime.fromisoformat(raw["expiry"]),
-                strike=raw["strike"],
-                contract_type=ContractType(raw["contract_type"]),
-                data=candles,
-            )
-
-            contracts.append(contract)
+        for file_path in contract_files(base_dir, symbol):
+            contracts.append(load_contract(file_path))
 
     return contracts
@@ -1,4 +1,3 @@
-import shutil
 import numpy as np
 from scipy.stats import norm
 from tqdm import tqdm
@@ -7,14 +6,20 @@ from datetime import datetime, time, timezone
 import json
 import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from pandera.typing import DataFrame
 
 from constants import MARKET_CLOSE
 from data.api.base import BaseAPI
 from data.funcs import get_option_symbol
+from data.metrics import profiled
 from data.models import Candle, Contract, ContractType
-from data.options.process_0dte import EnhancedJSONEncoder, load_contracts_from_json
+from data.options.process_0dte import (
+    EnhancedJSONEncoder,
+    contract_files,
+    contracts_dir,
+    load_contract,
+)
 from data.data_handler import DataHandler
 from tester.models import CandleModel
 
@@ -47,6 +52,7 @@ class SyntheticDataGenerator:
         d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
         return S * norm.pdf(d1) * np.sqrt(T)
 
+    @profiled("iv_solve")
     def implied_vol(self, price, S, K, T, r, contract_type: ContractType):
         if T <= 0:
             return 0.0
@@ -172,46 +178,16 @@ class SyntheticDataGenerator:
             data=candles,
         )
 
-    def _save_contracts_as_json(self, contracts: List[Contract]):
+    def _save_contracts_as_json(self, contracts: List[Contract], symbol: str):
+        namespace = contracts_dir(BASE_DIR, symbol)
+        os.makedirs(namespace, exist_ok=True)
         for contract in tqdm(contracts, desc="Saving contracts"):
-            file_path = os.path.join(BASE_DIR, f"{contract.symbol}.json")
+            file_path = os.path.join(namespace, f"{contract.symbol}.json")
             with open(file_path, "w") as f:
                 json.dump(asdict(contract), f, cls=EnhancedJSONEncoder, indent=2)
 
     def _load_synthetic_contracts(self, symbol: str) -> List[Contract]:
-        contracts: List[Contract] = []
-
-        for file_name in os.listdir(BASE_DIR):
-            if file_name.endswith(".json") and symbol in file_name:
-                file_path = os.path.join(BASE_DIR, file_name)
-                with open(file_path, "r") as f:
-                    raw = json.load(f)
-
-                candles = [
-                    Candle(
-                        open=c["open"],
-                        high=c["high"],
-                        low=c["low"],
-                        close=c["close"],
-                        volume=c["volume"],
-                        vwap=c["vwap"],
-                        timestamp=datetime.fromisoformat(c["timestamp"]),
-                    )
-                    for c in raw["data"]
-                ]
-
-                contracts.append(
-                    Contract(
-                        symbol=raw["symbol"],
-                        underlying_symbol=raw["underlying_symbol"],
-                        expiry=datetime.fromisoformat(raw["expiry"]),
-                        strike=raw["strike"],
-                        contract_type=ContractType(raw["contract_type"]),
-                        data=candles,
-                    )
-                )
-
-        return contracts
+        return [load_contract(path) for path in contract_files(BASE_DIR, symbol)]
 
     def _process_date_group(
         self, symbol: str, contracts: List[Contract], handler: DataHandler
@@ -248,8 +224,10 @@ class SyntheticDataGenerator:
 
         return gen_contracts
 
-    def generate_synthetic_data(self, symbol: str) -> List[Contract]:
-        handler = DataHandler(symbol)
+    def generate_synthetic_data(
+        self, symbol: str, handler: Optional[DataHandler] = None
+    ) -> List[Contract]:
+        handler = handler or DataHandler(symbol)
         all_gen_contracts = []
 
         for _, contracts in handler.contracts_by_date.items():
@@ -265,7 +243,7 @@ class SyntheticDataGenerator:
                 self._process_date_group(symbol, selected_contracts, handler)
             )
 
-        self._save_contracts_as_json(all_gen_contracts)
+        self._save_contracts_as_json(all_gen_contracts, symbol)
         return all_gen_contracts
 
     def clean_synthetic_data(self, symbol: str) -> List[Contract]:
@@ -279,8 +257,9 @@ class SyntheticDataGenerator:
         print(
             f"Total contracts cleaned: {len(cleaned_contracts)} / {len(all_contracts)}"
         )
-        shutil.rmtree(BASE_DIR)
-        os.mkdir(BASE_DIR)
-        self._save_contracts_as_json(cleaned_contracts)
+        # Only this symbol's files are replaced; other underlyings are kept.
+        for path in contract_files(BASE_DIR, symbol):
+            os.remove(path)
+        self._save_contracts_as_json(cleaned_contracts, symbol)
 
         return cleaned_contracts
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from data.api.base import BaseAPI
 from data.api.mock import MockAPI
+from data.metrics import profiled
 from data.models import Candle
 import os
 
@@ -12,6 +13,7 @@ BASE_DIR = Path("data/storage/stocks")
 os.makedirs(BASE_DIR, exist_ok=True)
 
 
+@profiled("json_load")
 def load_stock_from_json(symbol: str) -> List[Candle]:
     process_stocks = ProcessStocks(MockAPI())
     return process_stocks.load_stocks(symbol)
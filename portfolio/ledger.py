@@ -0,0 +1,195 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from constants import MARKET_CLOSE, MARKET_OPEN
+from portfolio.models import Position
+
+TRADING_DAYS_PER_YEAR = 252
+SESSION_SECONDS = (
+    datetime.combine(date.min, MARKET_CLOSE) - datetime.combine(date.min, MARKET_OPEN)
+).total_seconds()
+
+
+def _timestamps(values: list) -> np.ndarray:
+    # UTC epoch nanoseconds as naive datetime64. Engines stamp candles with
+    # pandas Timestamps, which carry them; replayed datetimes are converted.
+    return np.array(
+        [v.value if isinstance(v, pd.Timestamp) else pd.Timestamp(v).value for v in values],
+        dtype=np.int64,
+    ).view("datetime64[ns]")
+
+
+class TradeLedger:
+    """
+    Closed trades as parallel arrays, one entry per trade in recorded order,
+    with contract symbols stored once and referenced by `contract_id`.
+
+    Statistics are array reductions, so they stay cheap for the hundreds of
+    thousands of trades a parameter sweep produces.
+    """
+
+    def __init__(
+        self,
+        symbols: np.ndarray,
+        contract_id: np.ndarray,
+        entry_time: np.ndarray,
+        exit_time: np.ndarray,
+        entry_price: np.ndarray,
+        exit_price: np.ndarray,
+        pnl: np.ndarray,
+        pct_change: np.ndarray,
+    ):
+        self.symbols = symbols
+        self.contract_id = contract_id
+        self.entry_time = entry_time
+        self.exit_time = exit_time
+        self.entry_price = entry_price
+        self.exit_price = exit_price
+        self.pnl = pnl
+        self.pct_change = pct_change
+
+    @classmethod
+    def from_positions(cls, positions: List[Position]) -> "TradeLedger":
+        symbols, contract_id = np.unique(
+            np.array([p.contract.symbol for p in positions], dtype=str), return_inverse=True
+        )
+        return cls(
+            symbols=symbols,
+            contract_id=contract_id.astype(np.int32),
+            entry_time=_timestamps([p.entry_time for p in positions]),
+            exit_time=_timestamps([p.exit_option_candle.timestamp for p in positions]),
+            entry_price=np.array([p.entry_price for p in positions], dtype=float),
+            exit_price=np.array([p.exit_price for p in positions], dtype=float),
+            pnl=np.array([p.pnl for p in positions], dtype=float),
+            pct_change=np.array([p.pct_change for p in positions], dtype=float),
+        )
+
+    @classmethod
+    def concat(cls, ledgers: List["TradeLedger"]) -> "TradeLedger":
+        """
+        Joins ledgers in the given order, merging their symbol tables.
+        """
+        if not ledgers:
+            return cls.from_positions([])
+        symbols = np.unique(np.concatenate([l.symbols for l in ledgers]))
+        return cls(
+            symbols=symbols,
+            contract_id=np.concatenate(
+                [np.searchsorted(symbols, l.symbols)[l.contract_id] for l in ledgers]
+            ).astype(np.int32),
+            **{
+                field: np.concatenate([getattr(l, field) for l in ledgers])
+                for field in (
+                    "entry_time",
+                    "exit_time",
+                    "entry_price",
+                    "exit_price",
+                    "pnl",
+                    "pct_change",
+                )
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "symbol": self.symbols[self.contract_id],
+                "entry_time": self.entry_time,
+                "exit_time": self.exit_time,
+                "entry_price": self.entry_price,
+                "exit_price": self.exit_price,
+                "pnl": self.pnl,
+                "pct_change": self.pct_change,
+            }
+        )
+
+    def _days(self, days: Optional[Sequence[date]]) -> np.ndarray:
+        """
+        The days the ledger covers: `days` if given, else every weekday from
+        the first entry to the last exit.
+        """
+        if days is not None:
+            return np.array(sorted(days), dtype="datetime64[D]")
+        if not len(self):
+            return np.array([], dtype="datetime64[D]")
+        first = self.entry_time.min().astype("datetime64[D]")
+        last = self.exit_time.max().astype("datetime64[D]")
+        span = np.arange(first, last + 1)
+        return span[np.is_busday(span)]
+
+    def daily_pnl(self, days: Optional[Sequence[date]] = None) -> pd.Series:
+        """
+        Realized P&L per day, by exit day; days without exits are 0.
+        """
+        calendar = self._days(days)
+        exit_days = self.exit_time.astype("datetime64[D]")
+        calendar = np.union1d(calendar, exit_days)
+        pnl = np.bincount(
+            np.searchsorted(calendar, exit_days), weights=self.pnl, minlength=len(calendar)
+        )
+        return pd.Series(pnl, index=pd.DatetimeIndex(calendar, name="date"))
+
+    def equity_curve(self, days: Optional[Sequence[date]] = None) -> pd.Series:
+        """
+        Cumulative realized P&L at the end of each day.
+        """
+        return self.daily_pnl(days).cumsum()
+
+    def stats(self, days: Optional[Sequence[date]] = None) -> Dict[str, float]:
+        """
+        `Portfolio.stats` plus risk metrics over the daily P&L of `days`:
+        max drawdown (in dollars, from the running peak of the equity curve,
+        which starts at 0), annualized Sharpe and Sortino ratios, profit
+        factor and exposure, the fraction of session time with a position
+        open.
+        """
+        position_count = len(self)
+        pnl = self.pnl
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+
+        avg_gain = wins.mean() if len(wins) else 0
+        avg_loss = losses.mean() if len(losses) else 0
+        gross_gain = wins.sum()
+        gross_loss = -losses.sum()
+
+        daily = self.daily_pnl(days).to_numpy()
+        equity = np.cumsum(daily)
+        peak = np.maximum.accumulate(np.concatenate([[0.0], equity]))[1:]
+        max_drawdown = (peak - equity).max() if len(daily) else 0.0
+
+        annualize = np.sqrt(TRADING_DAYS_PER_YEAR)
+        mean = daily.mean() if len(daily) else 0.0
+        std = daily.std(ddof=1) if len(daily) > 1 else 0.0
+        downside = np.sqrt(np.mean(np.minimum(daily, 0) ** 2)) if len(daily) else 0.0
+
+        held = (self.exit_time - self.entry_time).astype("timedelta64[s]").astype(float)
+        session_seconds = len(self._days(days)) * SESSION_SECONDS
+
+        return {
+            "total_pnl": pnl.sum(),
+            "avg_return": self.pct_change.mean() if position_count else 0,
+            "win_rate": len(wins) / position_count * 100 if position_count else 0,
+            "avg_gain": avg_gain,
+            "avg_loss": avg_loss,
+            "positions": position_count,
+            "risk_reward": avg_gain / abs(avg_loss) if avg_loss != 0 else float("inf"),
+            "profit_factor": _ratio(gross_gain, gross_loss),
+            "max_drawdown": max_drawdown,
+            "sharpe": mean / std * annualize if std else 0.0,
+            "sortino": _ratio(mean, downside) * annualize,
+            "exposure": held.sum() / session_seconds if session_seconds else 0.0,
+        }
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    # inf for a positive numerator over nothing, e.g. no losing trades.
+    if denominator:
+        return numerator / denominator
+    return float("inf") if numerator > 0 else 0.0
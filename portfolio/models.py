@@ -1,11 +1,38 @@
 from dataclasses import dataclass, field
 from typing import Optional
 from datetime import datetime
+import numpy as np
 from data.models import Contract, ContractType
 from tester.models import CandleModel
 from constants import MARKET_CLOSE
 
 
+def settlement_path(
+    contract: Contract,
+    option_high: np.ndarray,
+    option_low: np.ndarray,
+    at_close: np.ndarray,
+    stock_close: np.ndarray,
+) -> np.ndarray:
+    """
+    Exit prices of `contract` over a run of minutes: the mid price, or the
+    intrinsic value at minutes stamped MARKET_CLOSE (`at_close`).
+    """
+    if contract.contract_type == ContractType.PUT:
+        intrinsic = np.maximum(0, contract.strike - stock_close)
+    else:
+        intrinsic = np.maximum(0, stock_close - contract.strike)
+    return np.where(at_close, intrinsic, (option_high + option_low) / 2)
+
+
+def pct_change_of(entry_prices: np.ndarray, exit_prices: np.ndarray) -> np.ndarray:
+    """
+    Vectorized pct_change, using the same operation order as compute_metrics.
+    """
+    pnl = (exit_prices - entry_prices) * 100
+    return pnl / entry_prices / 100
+
+
 @dataclass
 class Position:
     contract: Contract
@@ -35,6 +62,25 @@ class Position:
         self.pnl = (self.exit_price - self.entry_price) * 100
         self.pct_change = self.pnl / self.entry_price / 100
 
+    def exit_price_path(
+        self,
+        option_high: np.ndarray,
+        option_low: np.ndarray,
+        at_close: np.ndarray,
+        stock_close: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorized _calculate_exit_price over a run of minutes. `at_close` marks
+        the minutes stamped MARKET_CLOSE, which settle at intrinsic value.
+        """
+        return settlement_path(self.contract, option_high, option_low, at_close, stock_close)
+
+    def pct_change_path(self, exit_prices: np.ndarray) -> np.ndarray:
+        """
+        `pct_change_of` this position's entry price.
+        """
+        return pct_change_of(self.entry_price, exit_prices)
+
     def close(self) -> None:
         assert not self.closed, "Position already closed"
         self.closed = True
@@ -1,4 +1,6 @@
-from typing import Dict, List
+from datetime import date
+from typing import Dict, Optional, Sequence
+from portfolio.ledger import TradeLedger
 from portfolio.models import Position
 
 
@@ -12,27 +14,42 @@ class Portfolio:
     def get_position(self, symbol: str) -> Position:
         return self.positions_dt[symbol]
 
-    def summary(self):
-        positions = list(self.positions_dt.values())
-        position_count = len(positions)
-
-        total_profit = sum(p.pnl for p in positions)
-        total_return = sum(p.pct_change for p in positions)
-        avg_return = total_return / position_count if position_count else 0
-
-        wins = [p for p in positions if p.pnl > 0]
-        losses = [p for p in positions if p.pnl < 0]
-        win_rate = (len(wins) / position_count) * 100 if position_count else 0
-        avg_gain = sum(p.pnl for p in wins) / len(wins) if wins else 0
-        avg_loss = sum(p.pnl for p in losses) / len(losses) if losses else 0
-        risk_reward = avg_gain / abs(avg_loss) if avg_loss != 0 else float("inf")
-
-        print(f"Total P&L: {total_profit:.2f}")
-        print(f"Average Return: {avg_return:.2f}%")
-        print(f"Win Rate: {win_rate:.2f}%")
-        print(f"Avg Gain: {avg_gain:.2f}, Avg Loss: {avg_loss:.2f}")
-        print(f"Number of Positions: {position_count}")
-        print(f"Risk-Reward Ratio: {risk_reward:.2f}\n")
-
-        for p in positions:
+    def merge(self, other: "Portfolio"):
+        """
+        Appends another portfolio's positions, keeping their recorded order.
+        """
+        for symbol, position in other.positions_dt.items():
+            self.record_position(symbol, position)
+
+    def ledger(self) -> TradeLedger:
+        """
+        The positions as a columnar TradeLedger, in recorded order.
+        """
+        return TradeLedger.from_positions(list(self.positions_dt.values()))
+
+    def stats(self, days: Optional[Sequence[date]] = None) -> Dict[str, float]:
+        """
+        Summary and risk metrics, see `TradeLedger.stats`.
+        """
+        return self.ledger().stats(days)
+
+    def summary(self, days: Optional[Sequence[date]] = None):
+        """
+        Prints the stats over `days` (see `TradeLedger.stats`) and every position.
+        """
+        stats = self.stats(days)
+
+        print(f"Total P&L: {stats['total_pnl']:.2f}")
+        print(f"Average Return: {stats['avg_return']:.2f}%")
+        print(f"Win Rate: {stats['win_rate']:.2f}%")
+        print(f"Avg Gain: {stats['avg_gain']:.2f}, Avg Loss: {stats['avg_loss']:.2f}")
+        print(f"Number of Positions: {stats['positions']}")
+        print(f"Risk-Reward Ratio: {stats['risk_reward']:.2f}")
+        print(f"Profit Factor: {stats['profit_factor']:.2f}, Max Drawdown: {stats['max_drawdown']:.2f}")
+        print(
+            f"Sharpe: {stats['sharpe']:.2f}, Sortino: {stats['sortino']:.2f}, "
+            f"Exposure: {100 * stats['exposure']:.2f}%\n"
+        )
+
+        for p in self.positions_dt.values():
             p.summary()
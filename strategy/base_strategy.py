@@ -1,18 +1,88 @@
 from abc import ABC, abstractmethod
 from datetime import time
-from constants import MARKET_CLOSE
+from constants import MARKET_CLOSE, MARKET_OPEN
+from data.metrics import profiled
 from portfolio.models import Position
 from portfolio.portfolio import Portfolio
+from strategy.chain import ChainIndex
+from strategy.context import SessionContext
+from strategy.indicators import Indicator, IndicatorSet
+from strategy.lookback import LookbackWindow
+from tester.history import CandleArrays
 from tester.models import CandleModel
 from data.models import Contract
 from pandera.typing import DataFrame
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
 
 
 class BaseStrategy(ABC):
+    # Minutes of candles needed before the entry window opens. None keeps the
+    # whole session, e.g. for session high/low; 0 only needs the current bar.
+    stock_lookback: Optional[int] = None
+    option_lookback: Optional[int] = None
+    # Past sessions of stock candles kept in `history`, e.g. 1 for the prior
+    # close, 14 for a 14-day ATR.
+    history_days: int = 0
+
     def __init__(self, symbol: str):
         self.symbol = symbol
         self.portfolio = Portfolio()
+        self.indicators = IndicatorSet({})
+        self.context = SessionContext()
+        self.chain: Optional[ChainIndex] = None
+        self.history = LookbackWindow(self.history_days)
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """
+        Tunable parameters of this instance, as accepted by its constructor.
+        """
+        return {}
+
+    @property
+    def name(self) -> str:
+        params = ", ".join(f"{k}={v}" for k, v in self.params.items())
+        return f"{type(self).__name__}({params})"
+
+    def entry_window(self) -> Tuple[time, time]:
+        """
+        First and last minute at which `entry` may return a contract. The
+        backtester only calls `entry` inside this window.
+        """
+        return MARKET_OPEN, MARKET_CLOSE
+
+    def register_indicators(self) -> Dict[str, Indicator]:
+        """
+        Streaming indicators over the stock candles, created fresh each day.
+        The backtester feeds every candle up to the current minute before
+        calling `entry`, so `self.indicators["name"]` is the value as of now.
+        """
+        return {}
+
+    def start_day(self, chain: Optional[ChainIndex] = None):
+        """
+        Resets the per-day state: `context` (the current stock candle and
+        session stats, as plain floats), the registered indicators and
+        `chain`, the day's option chain sorted for strike/premium lookups.
+        """
+        self.context = SessionContext()
+        self.chain = chain
+        self.indicators = IndicatorSet(self.register_indicators())
+
+    def on_stock_candle(self, candle: CandleModel):
+        self.context.update(candle)
+        self.indicators.update(candle)
+
+    def day_filters(self) -> Dict[str, Callable[[pd.DataFrame], pd.Series]]:
+        """
+        Named day-level predicates, evaluated up front on the DataHandler's
+        `day_summary` (one row per day). Each returns a boolean Series that is
+        False for days on which `entry` can never return a contract; those
+        days are skipped without loading their option chains.
+        """
+        return {}
 
     @abstractmethod
     def entry(
@@ -37,6 +107,37 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def entry_signals(
+        self,
+        stock_arrays: CandleArrays,
+        chain: ChainIndex,
+        minutes: np.ndarray,
+    ) -> Optional[np.ndarray]:
+        """
+        Optional vectorized form of `entry` over a whole day. Given the day's
+        stock arrays, option chain and the session minutes of the entry
+        window, return a (minute, contract) matrix in chain order: booleans
+        marking where `entry` would pick the contract, or scores with -inf or
+        NaN where it would not (the highest score wins within a minute).
+        Return None to use the per-minute loop.
+        """
+        return None
+
+    def exit_path(
+        self,
+        contract: Contract,
+        position: Position,
+        pct_change: np.ndarray,
+    ) -> Optional[np.ndarray]:
+        """
+        Optional vectorized form of `exit` for strategies whose exit depends
+        only on the position's price path. Given the position's pct_change at
+        every remaining minute, return a boolean array marking the minutes at
+        which `exit` would return True, or None to use the per-minute loop.
+        """
+        return None
+
+    @profiled("entry_wrapper")
     def entry_wrapper(
         self,
         contracts_to_candles: Dict[Contract, DataFrame[CandleModel]],
@@ -45,14 +146,10 @@ class BaseStrategy(ABC):
         contract_to_enter = self.entry(contracts_to_candles, stock_candles)
         if contract_to_enter:
             op_candles = contracts_to_candles[contract_to_enter]
-            current_op_candle = self.get_current_candle(op_candles)
-            position = Position(
-                contract=contract_to_enter,
-                entry_option_candle=current_op_candle,
-            )
-            self.portfolio.record_position(contract_to_enter.symbol, position)
+            self.open_at(contract_to_enter, self.get_current_candle(op_candles))
         return contract_to_enter
 
+    @profiled("exit_wrapper")
     def exit_wrapper(
         self,
         contract: Contract,
@@ -74,6 +171,25 @@ class BaseStrategy(ABC):
             return True
         return False
 
+    def open_at(self, contract: Contract, option_candle: CandleModel):
+        """
+        Opens a position on `contract` at the given candle, for entries found
+        ahead of time by the vectorized entry engine.
+        """
+        position = Position(contract=contract, entry_option_candle=option_candle)
+        self.portfolio.record_position(contract.symbol, position)
+
+    def close_at(
+        self, contract: Contract, option_candle: CandleModel, stock_close: float
+    ):
+        """
+        Closes the position on `contract` at the given candle, for exits found
+        ahead of time by the vectorized exit engine.
+        """
+        position = self.portfolio.get_position(contract.symbol)
+        position.compute_metrics(option_candle, stock_close)
+        position.close()
+
     def get_current_time(self, candles: DataFrame[CandleModel]) -> time:
         return self.get_current_candle(candles).timestamp.time()
 
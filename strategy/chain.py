@@ -0,0 +1,118 @@
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from data.models import Contract, ContractType
+
+
+class _Side:
+    # Contracts of one type sorted by strike (ties keep the chain's order),
+    # with their rows of the close matrix (and their chain rows) in the same
+    # order.
+    def __init__(self, contracts: List[Contract], matrix: np.ndarray, rows: List[int]):
+        order = sorted(range(len(contracts)), key=lambda k: contracts[k].strike)
+        self.contracts = [contracts[k] for k in order]
+        self.strikes = [c.strike for c in self.contracts]
+        self.matrix = matrix[order]
+        self.rows = np.array([rows[k] for k in order], dtype=int)
+
+
+class ChainIndex:
+    """
+    A day's option chain sorted by (type, strike), with every contract's
+    close on one session-minute grid.
+
+    The backtester sets `minute` to the current session minute; `premiums`
+    then holds each contract's latest close, as `candles.iloc[-1].close` would.
+    Strike lookups are a bisect followed by a scan for the premium condition,
+    and resolve ties on strike to the contract listed first in the chain, like
+    `min`/`max` over the option map.
+    """
+
+    def __init__(self, closes: Dict[Contract, Tuple[int, np.ndarray]]):
+        """
+        :param closes: Per contract, the session minute of its first row and
+            its close column on the one-minute grid.
+        """
+        contracts = list(closes)
+        self.contracts = contracts
+        self.strikes = np.array([c.strike for c in contracts], dtype=float)
+        self.is_call = np.array(
+            [c.contract_type == ContractType.CALL for c in contracts], dtype=bool
+        )
+        self.start = min((offset for offset, _ in closes.values()), default=0)
+        end = max(
+            (offset + len(column) for offset, column in closes.values()),
+            default=self.start,
+        )
+
+        self.matrix = np.full((len(contracts), end - self.start), np.nan)
+        for row, (offset, column) in enumerate(closes.values()):
+            first = offset - self.start
+            self.matrix[row, first : first + len(column)] = column
+        self.minute = self.start
+
+        self.sides = {}
+        for contract_type in ContractType:
+            rows = [
+                k for k, c in enumerate(contracts) if c.contract_type == contract_type
+            ]
+            self.sides[contract_type] = _Side(
+                [contracts[k] for k in rows], self.matrix[rows], rows
+            )
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def premiums(self) -> np.ndarray:
+        return self.matrix[:, self.minute - self.start]
+
+    def set_premiums(self, minute: int, closes: np.ndarray):
+        """
+        Writes every contract's close at `minute`, in chain order, for chains
+        filled as bars arrive rather than loaded up front.
+        """
+        column = minute - self.start
+        self.matrix[:, column] = closes
+        for side in self.sides.values():
+            side.matrix[:, column] = closes[side.rows]
+
+    def premium_matrix(self, minutes: np.ndarray) -> np.ndarray:
+        """
+        Premiums at each of `minutes` (rows) for every contract in chain
+        order (columns).
+        """
+        return self.matrix[:, minutes - self.start].T
+
+    def nearest_call(self, min_strike: float, min_premium: float) -> Optional[Contract]:
+        """
+        The lowest-strike call with strike >= `min_strike` whose current
+        premium is at least `min_premium`.
+        """
+        side = self.sides[ContractType.CALL]
+        if not side.contracts:
+            return None
+        premiums = side.matrix[:, self.minute - self.start]
+        for k in range(bisect.bisect_left(side.strikes, min_strike), len(side.strikes)):
+            if premiums[k] >= min_premium:
+                return side.contracts[k]
+        return None
+
+    def nearest_put(self, max_strike: float, min_premium: float) -> Optional[Contract]:
+        """
+        The highest-strike put with strike <= `max_strike` whose current
+        premium is at least `min_premium`.
+        """
+        side = self.sides[ContractType.PUT]
+        if not side.contracts:
+            return None
+        premiums = side.matrix[:, self.minute - self.start]
+        found = None
+        for k in range(bisect.bisect_right(side.strikes, max_strike) - 1, -1, -1):
+            if found is not None and side.strikes[k] != side.strikes[found]:
+                break
+            if premiums[k] >= min_premium:
+                found = k
+        return None if found is None else side.contracts[found]
@@ -0,0 +1,68 @@
+from datetime import time
+from typing import Optional
+
+from tester.history import CandleArrays, CandleRow
+
+NAN = float("nan")
+
+
+class SessionContext:
+    """
+    The current stock candle and running statistics of the day's stock
+    candles, maintained by the backtester as plain floats.
+
+    Statistics cover every candle loaded for the day up to the current
+    minute, i.e. the same rows as the `stock_candles` passed to `entry`.
+    """
+
+    def __init__(self):
+        self.candle: Optional[CandleRow] = None
+        self.time: Optional[time] = None
+        self.open = self.high = self.low = self.close = NAN
+        self.volume = self.vwap = NAN
+
+        self.session_open = NAN
+        self.session_high = float("-inf")
+        self.session_low = float("inf")
+        self.session_volume = 0.0
+        self._notional = 0.0
+
+    @property
+    def session_vwap(self) -> float:
+        if not self.session_volume:
+            return NAN
+        return self._notional / self.session_volume
+
+    def warm_up(self, arrays: CandleArrays, count: int):
+        """
+        Folds the first `count` rows of `arrays` in with array reductions.
+        """
+        if count <= 0:
+            return
+        self.session_open = arrays.open[0]
+        self.session_high = max(self.session_high, arrays.high[:count].max())
+        self.session_low = min(self.session_low, arrays.low[:count].min())
+        self.session_volume += arrays.volume[:count].sum()
+        self._notional += (arrays.vwap[:count] * arrays.volume[:count]).sum()
+        self._set_candle(arrays.row(count - 1))
+
+    def update(self, candle: CandleRow):
+        if self.candle is None:
+            self.session_open = candle.open
+        if candle.high > self.session_high:
+            self.session_high = candle.high
+        if candle.low < self.session_low:
+            self.session_low = candle.low
+        self.session_volume += candle.volume
+        self._notional += candle.vwap * candle.volume
+        self._set_candle(candle)
+
+    def _set_candle(self, candle: CandleRow):
+        self.candle = candle
+        self.time = candle.timestamp.time()
+        self.open = candle.open
+        self.high = candle.high
+        self.low = candle.low
+        self.close = candle.close
+        self.volume = candle.volume
+        self.vwap = candle.vwap
@@ -1,10 +1,17 @@
 from datetime import time
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from data.models import Contract, ContractType
+from constants import MARKET_CLOSE
+from data.models import Contract
+from portfolio.models import Position
 from strategy.base_strategy import BaseStrategy
 from tester.models import CandleModel
 from pandera.typing import DataFrame
+from strategy.chain import ChainIndex
+from strategy.indicators import SMA, Indicator
+from tester.history import CandleArrays
+import numpy as np
+import pandas as pd
 import talib
 
 BUY_TIME = time(19, 45)
@@ -17,57 +24,121 @@ TAKE_PROFIT = 1.0
 
 
 class ExpStrategy(BaseStrategy):
-    def __init__(self, symbol: str):
+    # Session high/low need the whole day; options only need the current bar.
+    stock_lookback = None
+    option_lookback = 0
+
+    def __init__(
+        self,
+        symbol: str,
+        buy_time: time = BUY_TIME,
+        buf: float = BUF,
+        min_premium: float = MIN_PREMIUM,
+        min_range_pct: float = MIN_RANGE_PCT,
+        stop_loss: float = STOP_LOSS,
+        take_profit: float = TAKE_PROFIT,
+    ):
         super().__init__(symbol=symbol)
+        self.buy_time = buy_time
+        self.buf = buf
+        self.min_premium = min_premium
+        self.min_range_pct = min_range_pct
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {
+            "buy_time": self.buy_time,
+            "buf": self.buf,
+            "min_premium": self.min_premium,
+            "min_range_pct": self.min_range_pct,
+            "stop_loss": self.stop_loss,
+            "take_profit": self.take_profit,
+        }
+
+    def entry_window(self) -> Tuple[time, time]:
+        return self.buy_time, MARKET_CLOSE
+
+    def register_indicators(self) -> Dict[str, Indicator]:
+        return {"ma_short": SMA(10), "ma_long": SMA(20)}
+
+    def day_filters(self) -> Dict[str, Callable[[pd.DataFrame], pd.Series]]:
+        # The session range only grows during the day and the window's best
+        # premium bounds every candidate's, so these can never reject a day
+        # `entry` would trade.
+        return {
+            "range": lambda days: (days["high"] - days["low"]) / days["low"]
+            >= self.min_range_pct,
+            "premium": lambda days: days["max_premium"] >= self.min_premium,
+        }
 
     def entry(
         self,
         option_map: Dict[Contract, DataFrame[CandleModel]],
         stock_candles: DataFrame[CandleModel],
     ) -> Optional[Contract]:
-        if self.get_current_time(stock_candles) < BUY_TIME:
+        if self.context.time < self.buy_time:
             return None
 
-        current_price = self.get_current_candle(stock_candles).close
-        high = stock_candles["high"].max()
-        low = stock_candles["low"].min()
+        current_price = self.context.close
+        high = self.context.session_high
+        low = self.context.session_low
 
-        if (high - low) / low < MIN_RANGE_PCT:
+        if (high - low) / low < self.min_range_pct:
             return None
 
-        close_prices = stock_candles["close"].values
-        ma_short = talib.SMA(close_prices, timeperiod=10)[-1]
-        ma_long = talib.SMA(close_prices, timeperiod=20)[-1]
+        ma_short = self.indicators["ma_short"]
+        ma_long = self.indicators["ma_long"]
 
         is_near_high = abs(current_price - high) < abs(current_price - low)
         if is_near_high and ma_short < ma_long:
-            target_strike = current_price + BUF
-            candidates = {
-                c: candles
-                for c, candles in option_map.items()
-                if c.contract_type == ContractType.CALL
-                and c.strike >= target_strike
-                and candles.iloc[-1].close >= MIN_PREMIUM
-            }
-            if not candidates:
-                return None
-            return min(candidates.keys(), key=lambda c: c.strike)
+            return self.chain.nearest_call(current_price + self.buf, self.min_premium)
 
         elif not is_near_high and ma_short > ma_long:
-            target_strike = current_price - BUF
-            candidates = {
-                c: candles
-                for c, candles in option_map.items()
-                if c.contract_type == ContractType.PUT
-                and c.strike <= target_strike
-                and candles.iloc[-1].close >= MIN_PREMIUM
-            }
-            if not candidates:
-                return None
-            return max(candidates.keys(), key=lambda c: c.strike)
+            return self.chain.nearest_put(current_price - self.buf, self.min_premium)
 
         return None
 
+    def entry_signals(
+        self,
+        stock_arrays: CandleArrays,
+        chain: ChainIndex,
+        minutes: np.ndarray,
+    ) -> Optional[np.ndarray]:
+        rows = minutes - stock_arrays.offset
+        price = stock_arrays.close[rows]
+        high = np.maximum.accumulate(stock_arrays.high)[rows]
+        low = np.minimum.accumulate(stock_arrays.low)[rows]
+        # A prefix SMA's last value equals the full series' value at that row.
+        ma_short = talib.SMA(stock_arrays.close, timeperiod=10)[rows]
+        ma_long = talib.SMA(stock_arrays.close, timeperiod=20)[rows]
+
+        buy_minute = self.buy_time.hour * 60 + self.buy_time.minute
+        active = (stock_arrays.minute_of_day[rows] >= buy_minute) & ~(
+            (high - low) / low < self.min_range_pct
+        )
+        is_near_high = np.abs(price - high) < np.abs(price - low)
+        call_minutes = active & is_near_high & (ma_short < ma_long)
+        put_minutes = active & ~is_near_high & (ma_short > ma_long)
+
+        strikes = chain.strikes[np.newaxis, :]
+        affordable = chain.premium_matrix(minutes) >= self.min_premium
+        calls = (
+            call_minutes[:, np.newaxis]
+            & chain.is_call
+            & (strikes >= (price + self.buf)[:, np.newaxis])
+            & affordable
+        )
+        puts = (
+            put_minutes[:, np.newaxis]
+            & ~chain.is_call
+            & (strikes <= (price - self.buf)[:, np.newaxis])
+            & affordable
+        )
+        # Nearest strike wins: lowest call, highest put.
+        return np.where(calls, -strikes, np.where(puts, strikes, -np.inf))
+
     def exit(
         self,
         contract: Contract,
@@ -75,4 +146,15 @@ class ExpStrategy(BaseStrategy):
         stock_candles: DataFrame[CandleModel],
     ) -> bool:
         position = self.portfolio.get_position(contract.symbol)
-        return position.pct_change <= -STOP_LOSS or position.pct_change >= TAKE_PROFIT
+        return (
+            position.pct_change <= -self.stop_loss
+            or position.pct_change >= self.take_profit
+        )
+
+    def exit_path(
+        self,
+        contract: Contract,
+        position: Position,
+        pct_change: np.ndarray,
+    ) -> Optional[np.ndarray]:
+        return (pct_change <= -self.stop_loss) | (pct_change >= self.take_profit)
@@ -0,0 +1,247 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from tester.models import CandleModel
+
+NAN = float("nan")
+# TA-Lib's TA_IS_ZERO tolerance.
+EPSILON = 1e-14
+
+
+class Indicator(ABC):
+    """
+    Streaming indicator updated with one candle at a time in O(1).
+
+    `value` is NaN until enough candles were seen, like the leading values of
+    the matching TA-Lib function. Arithmetic follows TA-Lib's order of
+    operations: SMA, EMA and the rolling extremes match a TA-Lib call over the
+    same candles exactly, the Wilder-smoothed ATR and RSI to rounding error.
+    """
+
+    def __init__(self):
+        self.value = NAN
+
+    @abstractmethod
+    def update(self, candle: CandleModel) -> float:
+        pass
+
+
+class SMA(Indicator):
+    """
+    Simple moving average, as `talib.SMA`.
+    """
+
+    def __init__(self, period: int, source: str = "close"):
+        super().__init__()
+        self.period = period
+        self.source = source
+        self.window: Deque[float] = deque()
+        self.total = 0.0
+
+    def update(self, candle: CandleModel) -> float:
+        x = getattr(candle, self.source)
+        self.window.append(x)
+        self.total += x
+        if len(self.window) < self.period:
+            return self.value
+
+        self.value = self.total / self.period
+        self.total -= self.window.popleft()
+        return self.value
+
+
+class EMA(Indicator):
+    """
+    Exponential moving average seeded with the SMA of the first `period`
+    values, as `talib.EMA`.
+    """
+
+    def __init__(self, period: int, source: str = "close"):
+        super().__init__()
+        self.period = period
+        self.source = source
+        self.k = 2.0 / (period + 1)
+        self.count = 0
+        self.seed = 0.0
+
+    def update(self, candle: CandleModel) -> float:
+        x = getattr(candle, self.source)
+        self.count += 1
+        if self.count < self.period:
+            self.seed += x
+        elif self.count == self.period:
+            self.value = (self.seed + x) / self.period
+        else:
+            self.value = ((x - self.value) * self.k) + self.value
+        return self.value
+
+
+class _RollingExtreme(Indicator):
+    # Monotonic deque of (index, value); the front is the window's extreme.
+    def __init__(self, period: int, source: str):
+        super().__init__()
+        self.period = period
+        self.source = source
+        self.count = 0
+        self.candidates: Deque[Tuple[int, float]] = deque()
+
+    @abstractmethod
+    def _dominates(self, x: float, y: float) -> bool:
+        pass
+
+    def update(self, candle: CandleModel) -> float:
+        x = getattr(candle, self.source)
+        while self.candidates and self._dominates(x, self.candidates[-1][1]):
+            self.candidates.pop()
+        self.candidates.append((self.count, x))
+        if self.candidates[0][0] <= self.count - self.period:
+            self.candidates.popleft()
+
+        self.count += 1
+        if self.count >= self.period:
+            self.value = self.candidates[0][1]
+        return self.value
+
+
+class RollingHigh(_RollingExtreme):
+    """
+    Highest value over the last `period` candles, as `talib.MAX`.
+    """
+
+    def __init__(self, period: int, source: str = "high"):
+        super().__init__(period, source)
+
+    def _dominates(self, x: float, y: float) -> bool:
+        return x >= y
+
+
+class RollingLow(_RollingExtreme):
+    """
+    Lowest value over the last `period` candles, as `talib.MIN`.
+    """
+
+    def __init__(self, period: int, source: str = "low"):
+        super().__init__(period, source)
+
+    def _dominates(self, x: float, y: float) -> bool:
+        return x <= y
+
+
+class VWAP(Indicator):
+    """
+    Volume-weighted average price since the first candle, weighting each
+    candle's own VWAP by its volume. NaN while no volume has traded.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.volume = 0.0
+        self.notional = 0.0
+
+    def update(self, candle: CandleModel) -> float:
+        self.volume += candle.volume
+        self.notional += candle.vwap * candle.volume
+        if self.volume:
+            self.value = self.notional / self.volume
+        return self.value
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    # TA_TRUE_RANGE
+    result = high - low
+    result = max(result, abs(high - prev_close))
+    return max(result, abs(low - prev_close))
+
+
+class ATR(Indicator):
+    """
+    Average true range with Wilder smoothing, as `talib.ATR`.
+    """
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.count = 0
+        self.prev_close = NAN
+        self.seed = 0.0
+
+    def update(self, candle: CandleModel) -> float:
+        self.count += 1
+        if self.count > 1:
+            tr = _true_range(candle.high, candle.low, self.prev_close)
+            if self.count <= self.period:
+                self.seed += tr
+            elif self.count == self.period + 1:
+                self.value = (self.seed + tr) / self.period
+            else:
+                self.value = (self.value * (self.period - 1) + tr) / self.period
+        self.prev_close = candle.close
+        return self.value
+
+
+class RSI(Indicator):
+    """
+    Relative strength index with Wilder smoothing, as `talib.RSI`.
+    """
+
+    def __init__(self, period: int = 14, source: str = "close"):
+        super().__init__()
+        self.period = period
+        self.source = source
+        self.count = 0
+        self.prev = NAN
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def update(self, candle: CandleModel) -> float:
+        x = getattr(candle, self.source)
+        self.count += 1
+        if self.count == 1:
+            self.prev = x
+            return self.value
+
+        change = x - self.prev
+        self.prev = x
+        if self.count <= self.period + 1:
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            if self.count < self.period + 1:
+                return self.value
+            self.loss /= self.period
+            self.gain /= self.period
+        else:
+            self.loss *= self.period - 1
+            self.gain *= self.period - 1
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            self.loss /= self.period
+            self.gain /= self.period
+
+        total = self.gain + self.loss
+        self.value = 100.0 * (self.gain / total) if abs(total) >= EPSILON else 0.0
+        return self.value
+
+
+class IndicatorSet:
+    """
+    Named indicators fed from the same candle stream. `indicators["name"]`
+    is the indicator's current value.
+    """
+
+    def __init__(self, indicators: Dict[str, Indicator]):
+        self.indicators = indicators
+
+    def __bool__(self) -> bool:
+        return bool(self.indicators)
+
+    def __getitem__(self, name: str) -> float:
+        return self.indicators[name].value
+
+    def update(self, candle: CandleModel):
+        for indicator in self.indicators.values():
+            indicator.update(candle)
@@ -0,0 +1,120 @@
+from collections import deque
+from datetime import date
+from typing import Deque, List, NamedTuple, Optional
+
+import numpy as np
+
+from data.data_handler import DataHandler
+from tester.history import CandleArrays
+
+NAN = float("nan")
+
+
+class DayBars(NamedTuple):
+    """
+    One past session of stock candles, MARKET_OPEN to MARKET_CLOSE, with its
+    daily bar.
+    """
+
+    date: date
+    arrays: CandleArrays
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+class LookbackWindow:
+    """
+    The last `days` sessions with stock data before the current day, oldest
+    first, maintained by the backtester as it advances day by day.
+
+    Each day is loaded once, when it enters the window, and dropped when it
+    falls out. `open`, `high`, `low` and `close` are the daily bars as
+    arrays, so multi-day indicators need no reloads or concatenation.
+    """
+
+    def __init__(self, days: int = 0):
+        self.days: Deque[DayBars] = deque(maxlen=days)
+        self._refresh()
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __getitem__(self, i: int) -> DayBars:
+        return self.days[i]
+
+    def advance(self, data: DataHandler, dt: date):
+        """
+        Makes the window hold the sessions before `dt`. Only days not already
+        held are loaded, which is one day per trading day in a serial run.
+        """
+        if not self.days.maxlen:
+            return
+        wanted = data.prior_days(dt, self.days.maxlen)
+        if [d.date for d in self.days] == wanted:
+            return
+        held = {d.date: d for d in self.days}
+        self.days = deque(
+            (held.get(day) or self._load(data, day) for day in wanted),
+            maxlen=self.days.maxlen,
+        )
+        self._refresh()
+
+    def _load(self, data: DataHandler, day: date) -> DayBars:
+        arrays = CandleArrays(data.get_stock_candles(day))
+        return DayBars(
+            date=day,
+            arrays=arrays,
+            open=float(arrays.open[0]),
+            high=float(arrays.high.max()),
+            low=float(arrays.low.min()),
+            close=float(arrays.close[-1]),
+        )
+
+    def _refresh(self):
+        for column in ("open", "high", "low", "close"):
+            setattr(self, column, np.array([getattr(d, column) for d in self.days], dtype=float))
+
+    @property
+    def prior_close(self) -> float:
+        """
+        The last session's close, NaN without history.
+        """
+        return self.close[-1] if len(self.days) else NAN
+
+    def gap(self, open_price: float) -> float:
+        """
+        Overnight gap of `open_price` over the prior close, as a fraction.
+        """
+        return open_price / self.prior_close - 1
+
+    def true_range(self) -> np.ndarray:
+        """
+        Daily true range of each held day; the oldest has no prior close and
+        uses its high - low.
+        """
+        if not len(self.days):
+            return np.array([])
+        prev_close = np.concatenate([[NAN], self.close[:-1]])
+        ranges = np.vstack(
+            [
+                self.high - self.low,
+                np.abs(self.high - prev_close),
+                np.abs(self.low - prev_close),
+            ]
+        )
+        return np.nanmax(ranges, axis=0)
+
+    def atr(self, period: Optional[int] = None) -> float:
+        """
+        Mean true range over the last `period` days (default: all held),
+        NaN until that many days are held.
+        """
+        period = period or len(self.days)
+        if not period or len(self.days) < period:
+            return NAN
+        return float(self.true_range()[-period:].mean())
+
+    def dates(self) -> List[date]:
+        return [d.date for d in self.days]
@@ -1,50 +1,267 @@
-from datetime import date, datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
+import pandas as pd
 import pandas_market_calendars as mcal
 from pandera.typing import DataFrame
 from tqdm import tqdm
 
+from constants import MARKET_OPEN
+from data.metrics import profiled
 from data.models import Contract
+from portfolio.portfolio import Portfolio
 from strategy.base_strategy import BaseStrategy
+from strategy.chain import ChainIndex
+from tester.cache import DayResultCache, strategy_fingerprint
+from tester.checkpoint import Checkpoint, run_key
+from tester.entries import first_entry
+from tester.exits import first_exit_index
+from tester.history import (
+    CandleArrays,
+    CandleHistory,
+    Clock,
+    session_minute,
+    session_time,
+)
 from tester.models import CandleModel
 from data.data_handler import DataHandler
 
+ENGINES = ("pandas", "cursor")
+
+
+def get_trading_days(start: date, end: date) -> List[date]:
+    calendar = mcal.get_calendar("NYSE")
+    return [
+        dt.date()
+        for dt in calendar.valid_days(
+            start_date=str(start), end_date=str(end)
+        ).to_pydatetime()
+    ]
+
 
 class Backtester:
-    def __init__(self, strategy: BaseStrategy):
+    """
+    Replays each trading day minute by minute through a strategy.
+
+    The "pandas" engine hands strategies growing DataFrame slices. The "cursor"
+    engine preloads each day into arrays and hands strategies CandleHistory
+    views that follow a shared minute cursor, avoiding per-minute allocations.
+    With `vectorized_exits`, strategies implementing `exit_path` have their
+    exit minute found in a single pass instead of one exit call per minute;
+    likewise `vectorized_entries` and `entry_signals` for the entry. With a
+    `cache`, `run` only simulates days whose data or strategy changed since
+    they were cached, and with a `checkpoint` it saves its progress so an
+    interrupted run can be resumed.
+    """
+
+    def __init__(
+        self,
+        strategy: BaseStrategy,
+        engine: str = "pandas",
+        vectorized_exits: bool = True,
+        data: Optional[DataHandler] = None,
+        prefilter: bool = True,
+        vectorized_entries: bool = True,
+        cache: Optional[DayResultCache] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        resume: bool = False,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
         self.strategy = strategy
-        self.data = DataHandler(strategy.symbol, include_synthetic=True)
+        self.engine = engine
+        self.vectorized_exits = vectorized_exits
+        self.vectorized_entries = vectorized_entries
+        self.data = data or DataHandler(strategy.symbol, include_synthetic=True)
+        self.prefilter = prefilter
+        self.pruned: Dict[str, int] = {}
+        self.cache = cache
+        self.checkpoint = checkpoint
+        self.resume = resume
 
     def _get_trading_days(self, start: date, end: date) -> List[date]:
-        calendar = mcal.get_calendar("NYSE")
-        return [
-            dt.date()
-            for dt in calendar.valid_days(
-                start_date=str(start), end_date=str(end)
-            ).to_pydatetime()
-        ]
+        return get_trading_days(start, end)
 
     def run(self, start_date: date, end_date: date):
-        for current_date in tqdm(
-            self._get_trading_days(start_date, end_date), desc="Processing Days"
-        ):
+        days = self._get_trading_days(start_date, end_date)
+        if self.prefilter:
+            kept = self.prefilter_days(days)
+            for name, count in self.pruned.items():
+                print(f"Prefilter {name}: pruned {count} days")
+            print(f"Prefilter kept {len(kept)} of {len(days)} days")
+            days = kept
+        if self.cache is not None:
+            return self.run_cached(days)
+        return self._simulate(days)
+
+    def _simulate(self, days: List[date]):
+        if self.checkpoint is None:
+            return self.run_days(days)
+        return self.run_checkpointed(days)
+
+    def run_checkpointed(self, days: List[date]):
+        """
+        `run_days` in batches of `checkpoint.every` days, checkpointing after
+        each batch. With `resume`, continues after the last checkpointed day.
+        """
+        run = run_key(
+            strategy_fingerprint(self.strategy),
+            days,
+            [self.day_fingerprint(dt) for dt in days],
+        )
+        done = 0
+        state = self.checkpoint.load(run) if self.resume else None
+        if state is not None:
+            # Restored in place, so callers holding the strategy see its portfolio.
+            self.strategy.__dict__.update(state.strategy.__dict__)
+            done = state.days_done
+            print(f"Resuming after {state.last_day}: {done} of {len(days)} days done")
+
+        with tqdm(total=len(days), initial=done, desc="Processing Days") as bar:
+            for i in range(done, len(days), self.checkpoint.every):
+                batch = days[i : i + self.checkpoint.every]
+                self.run_days(batch, progress=False)
+                self.checkpoint.save(run, batch[-1], i + len(batch), self.strategy)
+                bar.update(len(batch))
+        return self.strategy.portfolio
+
+    def run_cached(self, days: List[date]):
+        """
+        `run_days`, reusing the cached positions of every day whose fingerprint
+        is unchanged and caching the rest once simulated.
+        """
+        config = strategy_fingerprint(self.strategy)
+        fingerprints = {dt: self.day_fingerprint(dt) for dt in days}
+        results = {dt: self.cache.get(config, dt, fingerprints[dt]) for dt in days}
+        missing = [dt for dt in days if results[dt] is None]
+        print(f"Day cache: {len(days) - len(missing)} hits, {len(missing)} misses")
+
+        if missing:
+            by_day: Dict[date, List] = {dt: [] for dt in missing}
+            for position in self._simulate(missing).positions_dt.values():
+                by_day[position.entry_time.date()].append(position)
+            for dt in missing:
+                results[dt] = by_day[dt]
+                self.cache.put(config, dt, by_day[dt], fingerprints[dt])
+
+        # Rebuild in day order, as an uncached run would have recorded them.
+        self.strategy.portfolio = Portfolio()
+        for dt in days:
+            for position in results[dt]:
+                self.strategy.portfolio.record_position(position.contract.symbol, position)
+        return self.strategy.portfolio
+
+    def day_fingerprint(self, dt: date) -> str:
+        """
+        Cache fingerprint of a day's result: `DataHandler.day_fingerprint` of
+        the day and of the sessions the strategy looks back on.
+        """
+        days = self.data.prior_days(dt, self.strategy.history_days) + [dt]
+        return ":".join(self.data.day_fingerprint(day) for day in days)
+
+    def prefilter_days(
+        self, days: List[date], summary: Optional[pd.DataFrame] = None
+    ) -> List[date]:
+        """
+        Drops the days rejected by the strategy's `day_filters`, recording in
+        `pruned` how many days each filter removed (in declaration order).
+        `summary` is the `day_summary` of `days` from the entry window start,
+        if the caller has already built it.
+        """
+        filters = self.strategy.day_filters()
+        if not filters:
+            return days
+
+        if summary is None:
+            summary = self.data.day_summary(days, self.strategy.entry_window()[0])
+        keep = pd.Series(True, index=summary.index)
+        for name, predicate in filters.items():
+            passed = predicate(summary).astype(bool)
+            self.pruned[name] = int((keep & ~passed).sum())
+            keep &= passed
+
+        rejected = set(keep.index[~keep])
+        return [dt for dt in days if dt not in rejected]
+
+    def run_days(self, days: List[date], progress: bool = True):
+        for current_date in tqdm(days, desc="Processing Days", disable=not progress):
             self._process_day(current_date)
         return self.strategy.portfolio
 
+    def day_window(self) -> Tuple[int, int, time, time]:
+        """
+        Session minutes of the strategy's entry window, and the times from
+        which stock and option candles must be loaded to honour its lookbacks.
+        """
+        window_start, window_end = self.strategy.entry_window()
+        first, last = session_minute(window_start), session_minute(window_end)
+
+        def load_from(lookback: Optional[int]) -> time:
+            if lookback is None:
+                return MARKET_OPEN
+            return session_time(max(first - lookback, 0))
+
+        return (
+            first,
+            last,
+            load_from(self.strategy.stock_lookback),
+            load_from(self.strategy.option_lookback),
+        )
+
+    @profiled("day")
     def _process_day(self, current_date: date):
+        self.strategy.history.advance(self.data, current_date)
+        if self.engine == "cursor":
+            self._process_day_cursor(current_date)
+            return
+
+        first, last, stock_from, option_from = self.day_window()
         contracts = self.data.get_contracts_for_date(current_date)
-        stock_candles = self.data.get_stock_candles(current_date)
+        stock_candles = self.data.get_stock_candles(current_date, stock_from)
 
         option_map: Dict[Contract, DataFrame[CandleModel]] = {
-            contract: self.data.get_option_candles(contract.symbol)
+            contract: self.data.get_option_candles(contract.symbol, option_from)
             for contract in contracts
         }
+        # Frames start at different minutes, so slice each by its own offset.
+        stock_offset = session_minute(stock_candles.index[0].time())
+        option_offsets = {
+            c: session_minute(candles.index[0].time())
+            for c, candles in option_map.items()
+        }
+        stock_arrays = CandleArrays(stock_candles)
+        chain = ChainIndex(
+            {
+                c: (option_offsets[c], candles["close"].to_numpy(dtype=float))
+                for c, candles in option_map.items()
+            }
+        )
+        last = min(last, stock_arrays.last_minute)
+
+        entry = self._vectorized_entry(stock_arrays, chain, first, last)
+        if entry is not None:
+            if entry:
+                minute, contract = entry
+                option_candles = option_map[contract]
+                self.strategy.open_at(
+                    contract, option_candles.iloc[minute - option_offsets[contract]]
+                )
+                self._process_contract(
+                    stock_arrays.row_at(minute).timestamp + timedelta(minutes=1),
+                    contract,
+                    option_candles,
+                    stock_candles,
+                )
+            return
 
-        for i in range(len(stock_candles)):
-            stock_slice = stock_candles.iloc[: i + 1]
+        self.start_day(stock_arrays, first, chain)
+        for i in range(first, last + 1):
+            self.advance(stock_arrays, i)
+            stock_slice = stock_candles.iloc[: i - stock_offset + 1]
             sliced_option_map = {
-                c: candles.iloc[: i + 1] for c, candles in option_map.items()
+                c: candles.iloc[: i - option_offsets[c] + 1]
+                for c, candles in option_map.items()
             }
 
             selected_contract: Optional[Contract] = self.strategy.entry_wrapper(
@@ -61,6 +278,63 @@ class Backtester:
                 )
                 break
 
+    @profiled("vectorized_entry")
+    def _vectorized_entry(
+        self, stock_arrays: CandleArrays, chain: ChainIndex, first: int, last: int
+    ) -> Optional[Union[Tuple[int, Contract], Tuple[()]]]:
+        """
+        Finds the day's entry in one pass if the strategy supports vectorized
+        entries: the (minute, contract) to enter, or an empty tuple if it does
+        not enter today. Returns None if the per-minute loop is needed.
+        """
+        if not self.vectorized_entries or not len(chain) or last < first:
+            return None
+
+        minutes = np.arange(first, last + 1)
+        scores = self.strategy.entry_signals(stock_arrays, chain, minutes)
+        if scores is None:
+            return None
+
+        self.strategy.start_day(chain)
+        return first_entry(scores, chain, first) or ()
+
+    def _enter_cursor(
+        self,
+        entry: Tuple[int, Contract],
+        option_arrays: CandleArrays,
+        stock_arrays: CandleArrays,
+        clock: Clock,
+    ):
+        """
+        Opens a vectorized entry and runs its exit on the cursor engine.
+        """
+        minute, contract = entry
+        self.strategy.open_at(contract, option_arrays.row_at(minute))
+        entry_time = stock_arrays.row_at(minute).timestamp.time()
+        self._process_contract_cursor(
+            session_minute(entry_time) + 1, contract, option_arrays, stock_arrays, clock
+        )
+
+    def start_day(self, stock_arrays: CandleArrays, first: int, chain: ChainIndex):
+        """
+        Resets the strategy's per-day state and warms up its context and
+        indicators with the stock candles loaded before the entry window.
+        """
+        self.strategy.start_day(chain)
+        if self.strategy.indicators:
+            for minute in range(stock_arrays.offset, first):
+                self.strategy.on_stock_candle(stock_arrays.row_at(minute))
+        else:
+            self.strategy.context.warm_up(stock_arrays, first - stock_arrays.offset)
+
+    def advance(self, stock_arrays: CandleArrays, minute: int):
+        """
+        Moves the strategy's chain and indicators to `minute`.
+        """
+        self.strategy.chain.minute = minute
+        self.strategy.on_stock_candle(stock_arrays.row_at(minute))
+
+    @profiled("exit_loop")
     def _process_contract(
         self,
         cur_time: datetime,
@@ -68,6 +342,14 @@ class Backtester:
         option_candles: DataFrame[CandleModel],
         stock_candles: DataFrame[CandleModel],
     ):
+        if self._vectorized_exit(
+            contract,
+            CandleArrays(option_candles),
+            CandleArrays(stock_candles),
+            session_minute(cur_time.time()),
+        ):
+            return
+
         end_time = cur_time.replace(hour=20, minute=0)
 
         while cur_time <= end_time:
@@ -89,3 +371,113 @@ class Backtester:
             option_candles=option_candles,
             stock_candles=stock_candles,
         ), f"Strategy did not exit by EOD for {contract.symbol}."
+
+    def _process_day_cursor(self, current_date: date):
+        first, last, stock_from, option_from = self.day_window()
+        contracts = self.data.get_contracts_for_date(current_date)
+        stock_arrays = CandleArrays(self.data.get_stock_candles(current_date, stock_from))
+
+        clock = Clock()
+        stock_history = CandleHistory(stock_arrays, clock)
+        option_map: Dict[Contract, CandleHistory] = {
+            contract: CandleHistory(
+                CandleArrays(self.data.get_option_candles(contract.symbol, option_from)),
+                clock,
+            )
+            for contract in contracts
+        }
+
+        chain = ChainIndex(
+            {c: (h.arrays.offset, h.arrays.close) for c, h in option_map.items()}
+        )
+        last = min(last, stock_arrays.last_minute)
+
+        entry = self._vectorized_entry(stock_arrays, chain, first, last)
+        if entry is not None:
+            if entry:
+                self._enter_cursor(
+                    entry, option_map[entry[1]].arrays, stock_arrays, clock
+                )
+            return
+
+        self.start_day(stock_arrays, first, chain)
+        for i in range(first, last + 1):
+            clock.minute = i
+            self.advance(stock_arrays, i)
+
+            selected_contract: Optional[Contract] = self.strategy.entry_wrapper(
+                contracts_to_candles=option_map,
+                stock_candles=stock_history,
+            )
+
+            if selected_contract is not None:
+                entry_time = stock_arrays.row_at(i).timestamp.time()
+                self._process_contract_cursor(
+                    session_minute(entry_time) + 1,
+                    selected_contract,
+                    option_map[selected_contract].arrays,
+                    stock_arrays,
+                    clock,
+                )
+                break
+
+    @profiled("exit_loop")
+    def _process_contract_cursor(
+        self,
+        start: int,
+        contract: Contract,
+        option_arrays: CandleArrays,
+        stock_arrays: CandleArrays,
+        clock: Clock,
+    ):
+        last = stock_arrays.last_minute
+
+        if self._vectorized_exit(contract, option_arrays, stock_arrays, start):
+            return
+
+        option_history = CandleHistory(option_arrays, clock, as_of=True)
+        stock_history = CandleHistory(stock_arrays, clock, as_of=True)
+
+        for i in range(start, last + 1):
+            clock.minute = i
+            if self.strategy.exit_wrapper(
+                contract=contract,
+                option_candles=option_history,
+                stock_candles=stock_history,
+            ):
+                return
+
+        # Final fallback exit (end of day)
+        clock.minute = last
+        assert self.strategy.exit_wrapper(
+            contract=contract,
+            option_candles=CandleHistory(option_arrays, clock),
+            stock_candles=CandleHistory(stock_arrays, clock),
+        ), f"Strategy did not exit by EOD for {contract.symbol}."
+
+    def _vectorized_exit(
+        self,
+        contract: Contract,
+        option_arrays: CandleArrays,
+        stock_arrays: CandleArrays,
+        start: int,
+    ) -> bool:
+        """
+        Closes the position at its first exit minute if the strategy supports
+        vectorized exits. Returns False if the per-minute loop is needed.
+        """
+        if not self.vectorized_exits:
+            return False
+
+        exit_minute = first_exit_index(
+            self.strategy, contract, option_arrays, stock_arrays, start
+        )
+        if exit_minute is None:
+            return False
+
+        self.strategy.close_at(
+            contract,
+            option_arrays.row_as_of(exit_minute),
+            stock_arrays.row_as_of(exit_minute).close,
+        )
+        return True
@@ -0,0 +1,81 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from portfolio.models import Position
+from strategy.base_strategy import BaseStrategy
+
+CacheKey = Tuple[str, str]
+
+
+def params_key(strategy_name: str, params: Dict[str, Any]) -> str:
+    return f"{strategy_name}:{json.dumps(params, sort_keys=True, default=str)}"
+
+
+def strategy_fingerprint(strategy: BaseStrategy) -> str:
+    """
+    The symbol, `params_key` and a digest of the source of every strategy class the
+    instance inherits from, so editing the strategy invalidates its results.
+    """
+    digest = hashlib.sha1()
+    for cls in type(strategy).__mro__:
+        if issubclass(cls, BaseStrategy):
+            digest.update(inspect.getsource(cls).encode())
+    config = params_key(type(strategy).__name__, strategy.params)
+    return f"{strategy.symbol}:{config}:{digest.hexdigest()}"
+
+
+class DayResultCache:
+    """
+    Positions produced by one strategy configuration on one trading day.
+
+    Single-day 0DTE strategies are independent across days, so any window of
+    days can be assembled from per-day results. Entries are kept in memory and,
+    if `path` is given, pickled to one file per key so repeated runs reuse them.
+    A day's `fingerprint` (see `DataHandler.day_fingerprint`) is part of its
+    key, so changed input data is simulated again.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.memory: Dict[CacheKey, List[Position]] = dict()
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def _file(self, key: CacheKey) -> str:
+        digest = hashlib.sha1("|".join(key).encode()).hexdigest()
+        return os.path.join(self.path, f"{digest}.pkl")
+
+    def get(
+        self, config: str, day: date, fingerprint: str = ""
+    ) -> Optional[List[Position]]:
+        key = (config, day.isoformat() + fingerprint)
+        if key not in self.memory and self.path is not None:
+            file_path = self._file(key)
+            if os.path.exists(file_path):
+                with open(file_path, "rb") as f:
+                    self.memory[key] = pickle.load(f)
+
+        positions = self.memory.get(key)
+        if positions is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return positions
+
+    def put(
+        self, config: str, day: date, positions: List[Position], fingerprint: str = ""
+    ):
+        key = (config, day.isoformat() + fingerprint)
+        self.memory[key] = positions
+        if self.path is not None:
+            tmp_path = f"{self._file(key)}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(positions, f)
+            os.replace(tmp_path, self._file(key))
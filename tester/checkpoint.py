@@ -0,0 +1,60 @@
+import hashlib
+import os
+import pickle
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+from strategy.base_strategy import BaseStrategy
+
+
+class CheckpointState(NamedTuple):
+    run: str
+    last_day: date
+    days_done: int
+    strategy: BaseStrategy
+
+
+def run_key(config: str, days: List[date], fingerprints: List[str]) -> str:
+    """
+    Identifies a run by its strategy fingerprint, the days it covers and their
+    data fingerprints, so a checkpoint is only resumed by the run that wrote
+    it, on the same data.
+    """
+    digest = hashlib.sha1(config.encode())
+    for dt, fingerprint in zip(days, fingerprints):
+        digest.update(f"{dt.isoformat()}:{fingerprint}".encode())
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Progress of a backtest, pickled to `path` after every `every` completed
+    days: the last completed day and the strategy, portfolio included.
+
+    Files are replaced atomically, so a crash mid-write leaves the previous
+    checkpoint intact.
+    """
+
+    def __init__(self, path: str, every: int = 20):
+        self.path = path
+        self.every = every
+
+    def load(self, run: str) -> Optional[CheckpointState]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            state: CheckpointState = pickle.load(f)
+        if state.run != run:
+            raise ValueError(
+                f"Checkpoint {self.path} was written by a different strategy, date range or data."
+            )
+        return state
+
+    def save(self, run: str, last_day: date, days_done: int, strategy: BaseStrategy):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(CheckpointState(run, last_day, days_done, strategy), f)
+        os.replace(tmp_path, self.path)
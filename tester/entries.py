@@ -0,0 +1,31 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from data.models import Contract
+from strategy.chain import ChainIndex
+
+
+def first_entry(
+    scores: np.ndarray, chain: ChainIndex, first: int
+) -> Optional[Tuple[int, Contract]]:
+    """
+    Picks the day's entry from a strategy's `entry_signals` matrix, whose
+    rows are the session minutes from `first` and columns the chain's
+    contracts.
+
+    The entry is the first minute with any qualifying contract (True, or a
+    finite score); within it, the highest-scoring contract, ties going to the
+    first in chain order. Returns None if nothing qualifies.
+    """
+    if scores.dtype == bool:
+        scores = np.where(scores, 0.0, -np.inf)
+    else:
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+
+    qualifying = (scores > -np.inf).any(axis=1)
+    if not qualifying.any():
+        return None
+
+    row = int(np.argmax(qualifying))
+    return first + row, chain.contracts[int(np.argmax(scores[row]))]
@@ -0,0 +1,61 @@
+from typing import Optional
+
+import numpy as np
+
+from constants import MARKET_CLOSE
+from data.models import Contract
+from strategy.base_strategy import BaseStrategy
+from tester.history import CandleArrays
+
+MARKET_CLOSE_MINUTE = MARKET_CLOSE.hour * 60 + MARKET_CLOSE.minute
+
+
+def first_exit_index(
+    strategy: BaseStrategy,
+    contract: Contract,
+    option_arrays: CandleArrays,
+    stock_arrays: CandleArrays,
+    start: int,
+) -> Optional[int]:
+    """
+    Finds the session minute at which an open position exits, in one
+    vectorized pass over the minutes from `start` to the end of the day.
+
+    The position's exit price and pct_change are computed for every remaining
+    minute at once; the first minute flagged by the strategy's `exit_path` or
+    stamped MARKET_CLOSE is the exit. Returns None if the strategy does not
+    implement `exit_path`, in which case the caller falls back to calling
+    `exit_wrapper` minute by minute.
+    """
+    last = stock_arrays.last_minute
+    if start > last:
+        return last
+
+    position = strategy.portfolio.get_position(contract.symbol)
+
+    # Like the per-minute loop, price each minute off the latest bar stamped
+    # at or before it rather than the back-filled grid row.
+    option_rows = (
+        option_arrays.as_of[start - option_arrays.offset : last - option_arrays.offset + 1] - 1
+    )
+    stock_rows = (
+        stock_arrays.as_of[start - stock_arrays.offset : last - stock_arrays.offset + 1] - 1
+    )
+
+    at_close = option_arrays.minute_of_day[option_rows] == MARKET_CLOSE_MINUTE
+    exit_prices = position.exit_price_path(
+        option_arrays.high[option_rows],
+        option_arrays.low[option_rows],
+        at_close,
+        stock_arrays.close[stock_rows],
+    )
+    signals = strategy.exit_path(
+        contract, position, position.pct_change_path(exit_prices)
+    )
+    if signals is None:
+        return None
+
+    triggered = signals | at_close
+    if not triggered.any():
+        return last
+    return start + int(np.argmax(triggered))
@@ -0,0 +1,176 @@
+from datetime import date, datetime, time
+from typing import List, NamedTuple
+
+import numpy as np
+from pandera.typing import DataFrame
+
+from constants import MARKET_OPEN
+from tester.models import CandleModel
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume", "vwap")
+OPEN_MINUTE = MARKET_OPEN.hour * 60 + MARKET_OPEN.minute
+
+
+def session_minute(t: time) -> int:
+    """
+    Minutes since MARKET_OPEN; the global cursor position of `t`.
+    """
+    return t.hour * 60 + t.minute - OPEN_MINUTE
+
+
+def session_time(minute: int) -> time:
+    minute += OPEN_MINUTE
+    return time(minute // 60, minute % 60)
+
+
+class CandleRow(NamedTuple):
+    """
+    A single candle with plain float fields, used in place of a pandas row.
+    """
+
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    vwap: float
+    date: date
+
+
+class Clock:
+    """
+    Shared minute cursor for every history view of a trading day, counted in
+    minutes since MARKET_OPEN.
+    """
+
+    def __init__(self, minute: int = 0):
+        self.minute = minute
+
+
+class CandleArrays:
+    """
+    Column arrays of a processed candle frame, built once per day.
+
+    Rows are on the frame's one-minute grid, which may start after
+    MARKET_OPEN; `offset` is the session minute of the first row. Back-filled
+    rows keep the timestamp of the bar they were filled from, and `as_of[k]`
+    counts the rows whose timestamp is not after grid minute k, i.e. the rows
+    a timestamp filter at that minute would keep.
+    """
+
+    def __init__(self, candles: DataFrame[CandleModel]):
+        self.timestamp: List[datetime] = list(candles["timestamp"])
+        self.date: List[date] = list(candles["date"])
+        self.minute_of_day = (
+            candles["timestamp"].dt.hour * 60 + candles["timestamp"].dt.minute
+        ).to_numpy()
+        for column in PRICE_COLUMNS:
+            values = candles[column].to_numpy(dtype=float)
+            values.setflags(write=False)
+            setattr(self, column, values)
+
+        grid = candles.index
+        self.offset = grid[0].hour * 60 + grid[0].minute - OPEN_MINUTE if len(self) else 0
+        self.as_of = np.searchsorted(
+            candles["timestamp"].to_numpy(), grid.to_numpy(), side="right"
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def last_minute(self) -> int:
+        return self.offset + len(self) - 1
+
+    def since(self, start: time) -> "CandleArrays":
+        """
+        The arrays `DataHandler.process_candles` would build from `start`: the
+        tail from the last bar at or before `start`, or from `start` if there
+        is none. Columns are views of these arrays.
+        """
+        i = session_minute(start) - self.offset
+        if i <= 0:
+            return self
+        if self.as_of[i]:
+            # That bar sits on the grid row of its own timestamp.
+            i = session_minute(self.timestamp[self.as_of[i] - 1].time()) - self.offset
+
+        tail = object.__new__(CandleArrays)
+        tail.timestamp = self.timestamp[i:]
+        tail.date = self.date[i:]
+        tail.minute_of_day = self.minute_of_day[i:]
+        for column in PRICE_COLUMNS:
+            setattr(tail, column, getattr(self, column)[i:])
+        tail.offset = self.offset + i
+        # Rows before the tail are all stamped at or before its first bar.
+        tail.as_of = np.maximum(self.as_of[i:] - i, 0)
+        return tail
+
+    def row_at(self, minute: int) -> CandleRow:
+        return self.row(minute - self.offset)
+
+    def row_as_of(self, minute: int) -> CandleRow:
+        return self.row(int(self.as_of[minute - self.offset]) - 1)
+
+    def row(self, i: int) -> CandleRow:
+        return CandleRow(
+            timestamp=self.timestamp[i],
+            open=self.open[i],
+            high=self.high[i],
+            low=self.low[i],
+            close=self.close[i],
+            volume=self.volume[i],
+            vwap=self.vwap[i],
+            date=self.date[i],
+        )
+
+
+class CandleHistory:
+    """
+    Read-only "history up to now" view over CandleArrays.
+
+    Supports the subset of the DataFrame interface strategies use on the hot
+    path: `history["close"]` returns a read-only NumPy view of the column up to
+    the current minute and `history.iloc[-1]` returns a CandleRow. Views follow
+    the shared Clock, so they should not be stored across calls.
+
+    By default the view ends at the current grid row, like `iloc[: i + 1]`.
+    With `as_of=True` it ends at the last bar stamped at or before the current
+    minute, like filtering on `timestamp <= now`, which is what exits use.
+    """
+
+    def __init__(self, arrays: CandleArrays, clock: Clock, as_of: bool = False):
+        self.arrays = arrays
+        self.clock = clock
+        self.as_of = as_of
+        self.iloc = _HistoryIndexer(self)
+
+    def __len__(self) -> int:
+        if self.as_of:
+            return int(self.arrays.as_of[self.clock.minute - self.arrays.offset])
+        return self.clock.minute - self.arrays.offset + 1
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        if column in PRICE_COLUMNS:
+            return getattr(self.arrays, column)[: len(self)]
+        if column in ("timestamp", "date"):
+            return np.array(getattr(self.arrays, column)[: len(self)], dtype=object)
+        raise KeyError(column)
+
+
+class _HistoryIndexer:
+    def __init__(self, history: CandleHistory):
+        self.history = history
+
+    def __getitem__(self, i: int) -> CandleRow:
+        n = len(self.history)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("History index out of range")
+        return self.history.arrays.row(i)
@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from typing import Any, Dict, List, Optional, Type
+
+import pandas as pd
+from tqdm import tqdm
+
+from data.data_handler import DataHandler, MissingDataError
+from portfolio.portfolio import Portfolio
+from strategy.base_strategy import BaseStrategy
+from tester.backtester import Backtester, get_trading_days
+
+
+def _run_symbol(
+    strategy_cls: Type[BaseStrategy],
+    symbol: str,
+    params: Dict[str, Any],
+    engine: str,
+    start_date: date,
+    end_date: date,
+) -> Portfolio:
+    # Each worker loads its own underlying, so loading runs concurrently too.
+    strategy = strategy_cls(symbol=symbol, **params)
+    backtester = Backtester(
+        strategy, engine=engine, data=DataHandler(symbol, include_synthetic=True)
+    )
+    days = backtester.prefilter_days(get_trading_days(start_date, end_date))
+    return backtester.run_days(days, progress=False)
+
+
+class MultiSymbolBacktester:
+    """
+    Runs the same strategy on several underlyings, one worker process per
+    symbol, and combines their portfolios.
+
+    Symbols without stored data are reported and left out of the results.
+    """
+
+    def __init__(
+        self,
+        strategy_cls: Type[BaseStrategy],
+        symbols: List[str],
+        params: Optional[Dict[str, Any]] = None,
+        engine: str = "cursor",
+        workers: Optional[int] = None,
+    ):
+        self.strategy_cls = strategy_cls
+        self.symbols = symbols
+        self.params = params or {}
+        self.engine = engine
+        self.workers = workers or min(len(symbols), os.cpu_count())
+        self.days: List[date] = []
+        self.portfolios: Dict[str, Portfolio] = {}
+        self.failed: Dict[str, str] = {}
+
+    def run(self, start_date: date, end_date: date) -> Dict[str, Portfolio]:
+        self.days = get_trading_days(start_date, end_date)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(
+                    _run_symbol,
+                    self.strategy_cls,
+                    symbol,
+                    self.params,
+                    self.engine,
+                    start_date,
+                    end_date,
+                ): symbol
+                for symbol in self.symbols
+            }
+            for future in tqdm(
+                as_completed(futures), total=len(futures), desc="Processing Symbols"
+            ):
+                symbol = futures[future]
+                try:
+                    self.portfolios[symbol] = future.result()
+                except MissingDataError as e:
+                    self.failed[symbol] = str(e)
+
+        # Report in the requested order, not completion order.
+        self.portfolios = {
+            s: self.portfolios[s] for s in self.symbols if s in self.portfolios
+        }
+        return self.portfolios
+
+    def combined(self) -> Portfolio:
+        portfolio = Portfolio()
+        for p in self.portfolios.values():
+            portfolio.merge(p)
+        return portfolio
+
+    def stats_table(self) -> pd.DataFrame:
+        """
+        Portfolio.stats() over the run's days per symbol plus the combined
+        portfolio, one column each.
+        """
+        stats = {s: p.stats(self.days) for s, p in self.portfolios.items()}
+        stats["ALL"] = self.combined().stats(self.days)
+        return pd.DataFrame(stats)
+
+    def summary(self):
+        for symbol, reason in self.failed.items():
+            print(f"Skipped {symbol}: {reason}")
+        print(self.stats_table().to_string(float_format="{:.2f}".format))
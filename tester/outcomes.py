@@ -0,0 +1,215 @@
+import os
+from datetime import date, time
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from constants import MARKET_CLOSE, MARKET_OPEN
+from data.data_handler import DataHandler
+from data.models import ContractType
+from portfolio.models import pct_change_of, settlement_path
+from tester.exits import MARKET_CLOSE_MINUTE
+from tester.history import OPEN_MINUTE, CandleArrays, session_minute, session_time
+
+
+class OutcomeMatrix(NamedTuple):
+    """
+    Outcome of entering every contract of a day's chain at every minute of
+    an entry window and holding it to the stop, the take-profit or expiry.
+
+    Rows are entry minutes and columns contracts in chain order. Cells are
+    NaN (exit minute -1) where the contract had no bar to enter on.
+    """
+
+    day: date
+    minutes: np.ndarray  # (M,) session minutes of entry
+    spot: np.ndarray  # (M,) stock close at entry
+    symbols: np.ndarray  # (K,)
+    strikes: np.ndarray  # (K,)
+    is_call: np.ndarray  # (K,)
+    entry_price: np.ndarray  # (M, K)
+    exit_minute: np.ndarray  # (M, K) session minute of exit
+    exit_price: np.ndarray  # (M, K)
+    pnl: np.ndarray  # (M, K)
+    pct_change: np.ndarray  # (M, K)
+
+
+def day_outcomes(
+    data: DataHandler,
+    day: date,
+    first: int,
+    last: int,
+    stop_loss: Optional[float],
+    take_profit: Optional[float],
+) -> Optional[OutcomeMatrix]:
+    """
+    Computes the day's outcome matrix for entries between session minutes
+    `first` and `last`, or None if the day has no data.
+
+    Prices follow `Position` and the backtester's exits: entries at the mid
+    price of the entry minute's bar, exits checked from the minute after the
+    entry's stock bar, at the mid price of the latest bar, or settled at
+    intrinsic value on the bar stamped MARKET_CLOSE. A None stop or
+    take-profit holds to expiry.
+    """
+    contracts = data.get_contracts_for_date(day)
+    if not contracts or data.parse_dt(day) not in data.stock_candles_dt_df:
+        return None
+    stock = CandleArrays(data.get_stock_candles(day, MARKET_OPEN))
+    end = stock.last_minute
+    first, last = max(first, stock.offset), min(last, end)
+    if last < first:
+        return None
+
+    minutes = np.arange(first, last + 1)
+    entry_rows = minutes - stock.offset
+    # Exits start the minute after the entry's stock bar, as in the backtester.
+    starts = stock.minute_of_day[entry_rows] - OPEN_MINUTE + 1
+    path = np.arange(first, end + 1)
+    open_minutes = path[np.newaxis, :] >= starts[:, np.newaxis]
+    stock_close = stock.close[stock.as_of[path - stock.offset] - 1]
+    stop = -np.inf if stop_loss is None else -stop_loss
+    target = np.inf if take_profit is None else take_profit
+
+    shape = (len(minutes), len(contracts))
+    entry_price = np.full(shape, np.nan)
+    exit_minute = np.full(shape, -1, dtype=int)
+    exit_price = np.full(shape, np.nan)
+    for k, contract in enumerate(contracts):
+        option = CandleArrays(data.get_option_candles(contract.symbol, MARKET_OPEN))
+        rows = minutes - option.offset
+        entered = (rows >= 0) & (rows < len(option))
+        rows = np.clip(rows, 0, len(option) - 1)
+        entry = np.where(entered, (option.high[rows] + option.low[rows]) / 2, np.nan)
+        entered &= entry > 0
+
+        path_rows = option.as_of[np.clip(path - option.offset, 0, len(option) - 1)] - 1
+        at_close = option.minute_of_day[path_rows] == MARKET_CLOSE_MINUTE
+        prices = settlement_path(
+            contract, option.high[path_rows], option.low[path_rows], at_close, stock_close
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = pct_change_of(entry[:, np.newaxis], prices[np.newaxis, :])
+        triggered = open_minutes & ((pct <= stop) | (pct >= target) | at_close)
+        # Positions that never trigger close at the day's last minute.
+        exits = np.where(triggered.any(axis=1), np.argmax(triggered, axis=1), len(path) - 1)
+
+        entry_price[entered, k] = entry[entered]
+        exit_minute[entered, k] = path[exits[entered]]
+        exit_price[entered, k] = prices[exits[entered]]
+
+    pnl = (exit_price - entry_price) * 100
+    return OutcomeMatrix(
+        day=day,
+        minutes=minutes,
+        spot=stock.close[entry_rows],
+        symbols=np.array([c.symbol for c in contracts]),
+        strikes=np.array([c.strike for c in contracts], dtype=float),
+        is_call=np.array([c.contract_type == ContractType.CALL for c in contracts]),
+        entry_price=entry_price,
+        exit_minute=exit_minute,
+        exit_price=exit_price,
+        pnl=pnl,
+        pct_change=pnl / entry_price / 100,
+    )
+
+
+def compute_outcomes(
+    data: DataHandler,
+    days: List[date],
+    start: time = MARKET_OPEN,
+    end: time = MARKET_CLOSE,
+    stop_loss: Optional[float] = None,
+    take_profit: Optional[float] = None,
+    output_dir: Optional[str] = None,
+) -> List[OutcomeMatrix]:
+    """
+    Outcome matrices of `days` for entries from `start` to `end`. With
+    `output_dir`, each day is saved there as it is computed and not kept in
+    memory, so months of chains fit; load them back with `load_outcomes`.
+    """
+    first, last = session_minute(start), session_minute(end)
+    matrices = []
+    for day in tqdm(days, desc="Outcome matrices"):
+        matrix = day_outcomes(data, day, first, last, stop_loss, take_profit)
+        if matrix is None:
+            continue
+        if output_dir:
+            save_outcomes(matrix, output_dir)
+        else:
+            matrices.append(matrix)
+    return matrices
+
+
+def save_outcomes(matrix: OutcomeMatrix, directory: str):
+    """
+    Writes one day as `<day>.npz`: prices and returns as float32, minutes as
+    int16, compressed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    np.savez_compressed(
+        os.path.join(directory, f"{matrix.day.isoformat()}.npz"),
+        day=np.array(matrix.day.isoformat()),
+        minutes=matrix.minutes.astype(np.int16),
+        spot=matrix.spot.astype(np.float32),
+        symbols=matrix.symbols,
+        strikes=matrix.strikes.astype(np.float32),
+        is_call=matrix.is_call,
+        entry_price=matrix.entry_price.astype(np.float32),
+        exit_minute=matrix.exit_minute.astype(np.int16),
+        exit_price=matrix.exit_price.astype(np.float32),
+        pnl=matrix.pnl.astype(np.float32),
+        pct_change=matrix.pct_change.astype(np.float32),
+    )
+
+
+def load_outcomes(
+    directory: str, start: Optional[date] = None, end: Optional[date] = None
+) -> List[OutcomeMatrix]:
+    """
+    Loads the days saved in `directory`, optionally limited to `start`–`end`,
+    in day order.
+    """
+    matrices = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".npz"):
+            continue
+        day = date.fromisoformat(name[: -len(".npz")])
+        if (start and day < start) or (end and day > end):
+            continue
+        with np.load(os.path.join(directory, name)) as f:
+            fields = {key: f[key] for key in OutcomeMatrix._fields if key != "day"}
+        matrices.append(OutcomeMatrix(day=day, **fields))
+    return matrices
+
+
+def outcomes_frame(matrices: List[OutcomeMatrix]) -> pd.DataFrame:
+    """
+    One row per entered (day, entry minute, contract) cell, for rule mining.
+    `distance` is the strike's distance from the stock at entry, positive
+    out of the money.
+    """
+    frames = []
+    for m in matrices:
+        rows, cols = np.nonzero(m.exit_minute >= 0)
+        distance = m.strikes[cols] - m.spot[rows]
+        frames.append(
+            pd.DataFrame(
+                {
+                    "day": m.day,
+                    "entry_time": [session_time(int(t)) for t in m.minutes[rows]],
+                    "symbol": m.symbols[cols],
+                    "strike": m.strikes[cols],
+                    "is_call": m.is_call[cols],
+                    "distance": np.where(m.is_call[cols], distance, -distance),
+                    "entry_price": m.entry_price[rows, cols],
+                    "exit_time": [session_time(int(t)) for t in m.exit_minute[rows, cols]],
+                    "exit_price": m.exit_price[rows, cols],
+                    "pnl": m.pnl[rows, cols],
+                    "pct_change": m.pct_change[rows, cols],
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,82 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from typing import List, Optional
+
+from tqdm import tqdm
+
+from data.data_handler import DataHandler
+from portfolio.portfolio import Portfolio
+from strategy.base_strategy import BaseStrategy
+from tester.backtester import Backtester
+
+
+def _run_chunk(
+    strategy: BaseStrategy,
+    engine: str,
+    vectorized_exits: bool,
+    vectorized_entries: bool,
+    data: DataHandler,
+    days: List[date],
+) -> Portfolio:
+    # The strategy arrives as a pickled copy, so each chunk owns its instance.
+    strategy.portfolio = Portfolio()
+    backtester = Backtester(
+        strategy,
+        engine=engine,
+        vectorized_exits=vectorized_exits,
+        vectorized_entries=vectorized_entries,
+        data=data,
+    )
+    return backtester.run_days(days, progress=False)
+
+
+class ParallelBacktester(Backtester):
+    """
+    Runs independent trading days on a process pool.
+
+    Days are split into consecutive chunks of `chunk_size`; each chunk is sent
+    to a worker with only its days' data and a fresh copy of the strategy. The
+    per-chunk portfolios are merged back in day order, so the result matches
+    a serial run.
+    """
+
+    def __init__(
+        self,
+        strategy: BaseStrategy,
+        workers: Optional[int] = None,
+        chunk_size: int = 5,
+        **kwargs,
+    ):
+        super().__init__(strategy, **kwargs)
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+
+    def run_days(self, days: List[date], progress: bool = True):
+        chunks = [
+            days[i : i + self.chunk_size] for i in range(0, len(days), self.chunk_size)
+        ]
+        results: List[Optional[Portfolio]] = [None] * len(chunks)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(
+                    _run_chunk,
+                    self.strategy,
+                    self.engine,
+                    self.vectorized_exits,
+                    self.vectorized_entries,
+                    self.data.subset(chunk, self.strategy.history_days),
+                    chunk,
+                ): i
+                for i, chunk in enumerate(chunks)
+            }
+            with tqdm(total=len(days), desc="Processing Days", disable=not progress) as bar:
+                for future in as_completed(futures):
+                    i = futures[future]
+                    results[i] = future.result()
+                    bar.update(len(chunks[i]))
+
+        for portfolio in results:
+            self.strategy.portfolio.merge(portfolio)
+        return self.strategy.portfolio
@@ -0,0 +1,294 @@
+import asyncio
+import json
+import time
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from constants import MARKET_CLOSE, MARKET_OPEN
+from data.data_handler import DataHandler
+from data.metrics import Histogram
+from data.models import Contract
+from portfolio.portfolio import Portfolio
+from strategy.base_strategy import BaseStrategy
+from strategy.chain import ChainIndex
+from tester.history import (
+    PRICE_COLUMNS,
+    CandleArrays,
+    CandleHistory,
+    CandleRow,
+    Clock,
+    session_minute,
+)
+
+SESSION_MINUTES = session_minute(MARKET_CLOSE) + 1
+DECISION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class MinuteBars(NamedTuple):
+    """
+    The bars that closed in one minute: the stock's and those of the option
+    contracts that traded, by contract symbol.
+    """
+
+    timestamp: datetime
+    stock: CandleRow
+    options: Dict[str, CandleRow]
+
+
+def _row(timestamp: datetime, bar: dict) -> CandleRow:
+    return CandleRow(
+        timestamp=timestamp,
+        date=timestamp.date(),
+        **{column: float(bar[column]) for column in PRICE_COLUMNS},
+    )
+
+
+def bars_to_json(bars: MinuteBars) -> str:
+    return json.dumps(
+        {
+            "timestamp": bars.timestamp.isoformat(),
+            "stock": {c: getattr(bars.stock, c) for c in PRICE_COLUMNS},
+            "options": {
+                symbol: {c: getattr(row, c) for c in PRICE_COLUMNS}
+                for symbol, row in bars.options.items()
+            },
+        }
+    )
+
+
+def bars_from_json(line: str) -> MinuteBars:
+    record = json.loads(line)
+    timestamp = datetime.fromisoformat(record["timestamp"])
+    return MinuteBars(
+        timestamp=timestamp,
+        stock=_row(timestamp, record["stock"]),
+        options={s: _row(timestamp, bar) for s, bar in record["options"].items()},
+    )
+
+
+async def storage_feed(
+    data: DataHandler, days: List[date], speed: float = 0.0
+) -> AsyncIterator[MinuteBars]:
+    """
+    Replays stored bars minute by minute. With `speed` > 0 each bar is
+    released when it would have closed, with the session clock running
+    `speed` times faster than real time (60: one minute per second); 0
+    releases bars as fast as they are consumed. Nights are skipped.
+    """
+    for day in days:
+        stock = data.stock_candles_dt_df.get(data.parse_dt(day))
+        if stock is None:
+            continue
+        options: Dict[datetime, Dict[str, CandleRow]] = {}
+        for contract in data.get_contracts_for_date(day):
+            for c in data.raw_option_candles[contract.symbol]:
+                options.setdefault(c.timestamp, {})[contract.symbol] = _row(
+                    c.timestamp, vars(c)
+                )
+
+        started = time.perf_counter()
+        session_start = None
+        for candle in stock.itertuples(index=False):
+            t = candle.timestamp.time()
+            if not MARKET_OPEN <= t <= MARKET_CLOSE:
+                continue
+            if session_start is None:
+                session_start = candle.timestamp
+            if speed > 0:
+                closes_at = (candle.timestamp - session_start + timedelta(minutes=1)) / speed
+                await asyncio.sleep(
+                    max(0.0, closes_at.total_seconds() - (time.perf_counter() - started))
+                )
+            yield MinuteBars(
+                timestamp=candle.timestamp,
+                stock=_row(candle.timestamp, candle._asdict()),
+                options=options.get(candle.timestamp, {}),
+            )
+
+
+async def file_tail_feed(
+    path: str, poll: float = 0.1, idle_timeout: Optional[float] = None
+) -> AsyncIterator[MinuteBars]:
+    """
+    Follows a file of `bars_to_json` lines, like `tail -f`, standing in for a
+    live feed. Stops at a `{"end": true}` line, or after `idle_timeout`
+    seconds without new bars.
+    """
+    with open(path) as f:
+        buffer = ""
+        idle = 0.0
+        while True:
+            line = f.readline()
+            if not line:
+                if idle_timeout is not None and idle >= idle_timeout:
+                    return
+                await asyncio.sleep(poll)
+                idle += poll
+                continue
+            buffer += line
+            if not buffer.endswith("\n"):
+                continue  # Partially written line.
+            line, buffer, idle = buffer, "", 0.0
+            if not line.strip():
+                continue
+            if json.loads(line).get("end"):
+                return
+            yield bars_from_json(line)
+
+
+class _LiveArrays(CandleArrays):
+    """
+    CandleArrays filled as bars arrive. Every session minute gets a row
+    stamped with that minute: the minute's bar, or else the previous row's
+    values carried forward (NaN before the first bar). Unlike the
+    backtester's back-fill this never looks ahead.
+    """
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        self.timestamp: List[datetime] = []
+        self.date: List[date] = []
+        for column in PRICE_COLUMNS:
+            setattr(self, column, np.full(SESSION_MINUTES - offset, np.nan))
+        self.minute_of_day = np.zeros(SESSION_MINUTES - offset, dtype=int)
+        self.as_of = np.arange(1, SESSION_MINUTES - offset + 1)
+
+    def append(self, timestamp: datetime, bar: Optional[CandleRow]):
+        i = len(self)
+        self.timestamp.append(timestamp)
+        self.date.append(timestamp.date())
+        self.minute_of_day[i] = timestamp.hour * 60 + timestamp.minute
+        for column in PRICE_COLUMNS:
+            values = getattr(self, column)
+            if bar is not None:
+                values[i] = getattr(bar, column)
+            elif i:
+                values[i] = values[i - 1]
+
+
+class ReplayTrader:
+    """
+    Trades a strategy from a feed of minute bars on an asyncio event loop,
+    as it would run live.
+
+    Each bar updates the strategy's context, indicators and chain, then
+    `entry_wrapper` runs on every bar of the entry window until it enters
+    and `exit_wrapper` on every later bar until it exits. Positions go to the
+    strategy's `Portfolio`. The time from a bar's arrival to its decision is
+    recorded and compared with `budget` seconds.
+    """
+
+    def __init__(self, strategy: BaseStrategy, data: DataHandler, budget: float = 1.0):
+        self.strategy = strategy
+        self.data = data
+        self.budget = budget
+        first, last = strategy.entry_window()
+        self.first = session_minute(first)
+        self.last = session_minute(last)
+
+        self.latency = Histogram(DECISION_BUCKETS)
+        self.latencies: List[float] = []
+        self.over_budget = 0
+        self.bars = 0
+        self.days: List[date] = []
+
+        self.day: Optional[date] = None
+        self.position: Optional[Contract] = None
+        self.traded = False
+
+    async def run(self, feed: AsyncIterator[MinuteBars]) -> Portfolio:
+        async for bars in feed:
+            received = time.perf_counter()
+            self.on_bars(bars)
+            self._observe(time.perf_counter() - received)
+        if self.position is not None:
+            print(f"Feed ended with {self.position.symbol} still open.")
+        return self.strategy.portfolio
+
+    def _observe(self, seconds: float):
+        self.bars += 1
+        self.latencies.append(seconds)
+        self.latency.observe(seconds)
+        if seconds > self.budget:
+            self.over_budget += 1
+
+    def _start_day(self, day: date, minute: int):
+        self.day = day
+        self.days.append(day)
+        self.position = None
+        self.traded = False
+        self.strategy.history.advance(self.data, day)
+        self.clock = Clock(minute)
+        self.contracts = self.data.get_contracts_for_date(day)
+        self.stock_arrays = _LiveArrays(minute)
+        self.option_arrays = {c: _LiveArrays(minute) for c in self.contracts}
+        self.stock_history = CandleHistory(self.stock_arrays, self.clock)
+        self.option_map = {
+            c: CandleHistory(a, self.clock) for c, a in self.option_arrays.items()
+        }
+        self.chain = ChainIndex({c: (minute, a.close) for c, a in self.option_arrays.items()})
+        self.strategy.start_day(self.chain)
+
+    def on_bars(self, bars: MinuteBars):
+        minute = session_minute(bars.timestamp.time())
+        if bars.timestamp.date() != self.day:
+            self._start_day(bars.timestamp.date(), minute)
+        if not self.stock_arrays.offset + len(self.stock_arrays) <= minute < SESSION_MINUTES:
+            return  # Repeated, out of order or outside the session.
+
+        # Carry every series forward over minutes the feed skipped.
+        for current in range(self.stock_arrays.offset + len(self.stock_arrays), minute + 1):
+            timestamp = bars.timestamp - timedelta(minutes=minute - current)
+            now = current == minute
+            self.stock_arrays.append(timestamp, bars.stock if now else None)
+            for contract, arrays in self.option_arrays.items():
+                arrays.append(timestamp, bars.options.get(contract.symbol) if now else None)
+            self.chain.set_premiums(
+                current,
+                np.array([a.close[current - a.offset] for a in self.option_arrays.values()]),
+            )
+            self.clock.minute = current
+            self.strategy.chain.minute = current
+            self.strategy.on_stock_candle(self.stock_arrays.row_at(current))
+
+        if self.position is not None:
+            if self.strategy.exit_wrapper(
+                contract=self.position,
+                option_candles=self.option_map[self.position],
+                stock_candles=self.stock_history,
+            ):
+                self.position = None
+        elif not self.traded and self.first <= minute <= self.last:
+            self.position = self.strategy.entry_wrapper(
+                contracts_to_candles=self.option_map,
+                stock_candles=self.stock_history,
+            )
+            self.traded = self.position is not None
+
+    def latency_report(self) -> dict:
+        latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            "bars": self.bars,
+            "days": len(self.days),
+            "budget_seconds": self.budget,
+            "over_budget": self.over_budget,
+            "p50_seconds": float(p50),
+            "p95_seconds": float(p95),
+            "p99_seconds": float(p99),
+            "max_seconds": float(latencies.max()),
+            "histogram": self.latency.to_dict(),
+        }
+
+    def summary(self):
+        report = self.latency_report()
+        print(f"Replayed {report['bars']} bars over {report['days']} days")
+        print(
+            "Decision latency: "
+            f"p50 {report['p50_seconds'] * 1000:.2f} ms, "
+            f"p99 {report['p99_seconds'] * 1000:.2f} ms, "
+            f"max {report['max_seconds'] * 1000:.2f} ms; "
+            f"{report['over_budget']} bars over the {self.budget * 1000:.0f} ms budget"
+        )
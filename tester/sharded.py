@@ -0,0 +1,261 @@
+import json
+import os
+import pickle
+import socket
+import time
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Type
+
+from tqdm import tqdm
+
+from data.data_handler import DataHandler
+from portfolio.models import Position
+from portfolio.portfolio import Portfolio
+from strategy.base_strategy import BaseStrategy
+from tester.backtester import Backtester
+
+
+class WorkUnit(NamedTuple):
+    """
+    One parameter set over one consecutive range of trading days.
+    """
+
+    id: str
+    config: int
+    params: Dict[str, Any]
+    days: List[date]
+
+
+class ShardQueue:
+    """
+    Work queue on a filesystem shared by every worker, e.g. an NFS mount.
+
+    A worker claims a unit by creating its lock file with O_EXCL and renews
+    the lease by touching it after every simulated day; a lock untouched
+    for `lease` seconds belongs to a dead worker and may be taken over. A
+    worker that finds its lock taken over abandons the unit to the new owner.
+    Results are written under a temporary name and renamed into place, and
+    a unit with a result is done. Results are deterministic, so a unit that
+    ends up run twice (a slow worker losing its lease) just writes the same
+    result again.
+    """
+
+    def __init__(self, path: str, lease: float = 600.0):
+        self.path = path
+        self.lease = lease
+        self.locks = os.path.join(path, "locks")
+        self.results = os.path.join(path, "results")
+
+    def create(
+        self,
+        strategy_cls: Type[BaseStrategy],
+        symbol: str,
+        engine: str,
+        configs: List[Dict[str, Any]],
+        days: List[date],
+        days_per_unit: int,
+        sweep: bool = False,
+    ) -> List[WorkUnit]:
+        """
+        Splits every config's days into units. Creating a queue that already
+        exists with the same work is a no-op, so every machine may run it.
+        `sweep` records whether the configs come from a parameter sweep, which
+        decides how the results are reported once merged.
+        """
+        chunks = [days[i : i + days_per_unit] for i in range(0, len(days), days_per_unit)]
+        units = [
+            WorkUnit(f"{c:04d}-{k:04d}", c, params, chunk)
+            for c, params in enumerate(configs)
+            for k, chunk in enumerate(chunks)
+        ]
+        manifest = {
+            "strategy_cls": strategy_cls,
+            "symbol": symbol,
+            "engine": engine,
+            "sweep": sweep,
+            "units": units,
+        }
+
+        if os.path.exists(self._manifest_path()):
+            if self.manifest() != manifest:
+                raise ValueError(f"Queue {self.path} already holds different work.")
+            return units
+
+        os.makedirs(self.locks, exist_ok=True)
+        os.makedirs(self.results, exist_ok=True)
+        self._write_atomic(self._manifest_path(), manifest)
+        return units
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.path, "manifest.pkl")
+
+    def manifest(self) -> Dict[str, Any]:
+        with open(self._manifest_path(), "rb") as f:
+            return pickle.load(f)
+
+    def _lock(self, unit: WorkUnit) -> str:
+        return os.path.join(self.locks, f"{unit.id}.lock")
+
+    def _result(self, unit: WorkUnit) -> str:
+        return os.path.join(self.results, f"{unit.id}.pkl")
+
+    def _write_atomic(self, path: str, value: Any):
+        # Unique per process, so concurrent writers never share a temp file.
+        tmp_path = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f)
+        os.replace(tmp_path, path)
+
+    def is_done(self, unit: WorkUnit) -> bool:
+        return os.path.exists(self._result(unit))
+
+    def _expired(self, path: str) -> bool:
+        try:
+            return time.time() - os.stat(path).st_mtime > self.lease
+        except FileNotFoundError:
+            return True
+
+    def _try_claim(self, unit: WorkUnit, worker: str) -> bool:
+        lock = self._lock(unit)
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self._expired(lock):
+                return False
+            # Only one worker's rename of the stale lock can succeed.
+            stale = f"{lock}.{worker}.stale"
+            try:
+                os.rename(lock, stale)
+            except FileNotFoundError:
+                return False
+            if not self._expired(stale):
+                # Lost a race and moved a fresh lock; put it back.
+                try:
+                    os.link(stale, lock)
+                except FileExistsError:
+                    pass
+                os.remove(stale)
+                return False
+            os.remove(stale)
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                return False
+
+        with os.fdopen(fd, "w") as f:
+            json.dump(
+                {"worker": worker, "host": socket.gethostname(), "pid": os.getpid()}, f
+            )
+        return True
+
+    def claim(self, worker: str) -> Optional[WorkUnit]:
+        for unit in self.manifest()["units"]:
+            if self.is_done(unit) or not self._try_claim(unit, worker):
+                continue
+            if self.is_done(unit):
+                # Finished by another worker between the check and the claim.
+                self.release(unit)
+                continue
+            return unit
+        return None
+
+    def _owner(self, unit: WorkUnit) -> Optional[str]:
+        try:
+            with open(self._lock(unit)) as f:
+                return json.load(f)["worker"]
+        except (FileNotFoundError, ValueError, KeyError):
+            # Missing, or just created by another worker and not written yet.
+            return None
+
+    def renew(self, unit: WorkUnit, worker: str) -> bool:
+        """
+        Extends `worker`'s lease on `unit`.
+
+        :return: False if the lock is gone or now held by another worker, i.e.
+            the lease expired and the unit was taken over.
+        """
+        if self._owner(unit) != worker:
+            return False
+        os.utime(self._lock(unit))
+        return True
+
+    def release(self, unit: WorkUnit, worker: Optional[str] = None):
+        """
+        Removes the lock on `unit`; with `worker`, only if that worker holds it.
+        """
+        if worker is not None and self._owner(unit) != worker:
+            return
+        try:
+            os.remove(self._lock(unit))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, unit: WorkUnit, positions: List[Position]):
+        self._write_atomic(self._result(unit), positions)
+        self.release(unit)
+
+    def positions(self, unit: WorkUnit) -> Optional[List[Position]]:
+        if not self.is_done(unit):
+            return None
+        with open(self._result(unit), "rb") as f:
+            return pickle.load(f)
+
+    def status(self) -> Dict[str, int]:
+        units = self.manifest()["units"]
+        done = sum(self.is_done(u) for u in units)
+        running = sum(
+            not self.is_done(u) and not self._expired(self._lock(u)) for u in units
+        )
+        return {"units": len(units), "done": done, "running": running}
+
+
+def run_worker(queue: ShardQueue, worker: str) -> int:
+    """
+    Claims and runs units until none is left to claim.
+
+    :return: The number of units this worker completed.
+    """
+    manifest = queue.manifest()
+    data = DataHandler(manifest["symbol"], include_synthetic=True)
+    completed = 0
+
+    while (unit := queue.claim(worker)) is not None:
+        strategy = manifest["strategy_cls"](symbol=manifest["symbol"], **unit.params)
+        backtester = Backtester(strategy, engine=manifest["engine"], data=data)
+        lost = False
+        try:
+            for day in tqdm(backtester.prefilter_days(unit.days), desc=f"Unit {unit.id}"):
+                backtester.run_days([day], progress=False)
+                if not queue.renew(unit, worker):
+                    lost = True
+                    break
+        except BaseException:
+            queue.release(unit, worker)
+            raise
+        if lost:
+            # Neither complete nor release: the lock belongs to the new owner.
+            print(f"Lost the lease on unit {unit.id}; leaving it to its new owner.")
+            continue
+        queue.complete(unit, list(strategy.portfolio.positions_dt.values()))
+        completed += 1
+
+    return completed
+
+
+def merge(queue: ShardQueue) -> Dict[int, Portfolio]:
+    """
+    Assembles each config's portfolio from its units in day order.
+
+    :raises ValueError: If a unit has no result yet.
+    """
+    units = queue.manifest()["units"]
+    missing = [u.id for u in units if not queue.is_done(u)]
+    if missing:
+        raise ValueError(f"{len(missing)} units have no result yet: {', '.join(missing[:10])}")
+
+    portfolios: Dict[int, Portfolio] = {}
+    for unit in sorted(units, key=lambda u: (u.config, u.days[0])):
+        portfolio = portfolios.setdefault(unit.config, Portfolio())
+        for position in queue.positions(unit):
+            portfolio.record_position(position.contract.symbol, position)
+    return portfolios
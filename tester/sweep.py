@@ -0,0 +1,129 @@
+import itertools
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from tqdm import tqdm
+
+from data.data_handler import DataHandler
+from strategy.base_strategy import BaseStrategy
+from tester.backtester import Backtester, get_trading_days
+
+ParamSpace = Dict[str, Union[Sequence[Any], Tuple[float, float]]]
+
+# Set in each worker by _init_worker; under the default fork start method the
+# handler is inherited from the parent instead of being copied per config.
+_SHARED_DATA: Optional[DataHandler] = None
+
+
+def grid_configs(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Every combination of the listed parameter values.
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_configs(space: ParamSpace, samples: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Draws `samples` configurations. Lists are sampled uniformly from their
+    values and (low, high) tuples uniformly from the interval.
+    """
+    rng = random.Random(seed)
+
+    def draw(values):
+        if isinstance(values, tuple):
+            return rng.uniform(*values)
+        return rng.choice(list(values))
+
+    return [{name: draw(values) for name, values in space.items()} for _ in range(samples)]
+
+
+def result_line(result: Dict[str, Any]) -> str:
+    """
+    One JSON line of a sweep report. Infinite ratios (e.g. the profit factor
+    of a run without losing trades) are written as null, as JSON has no
+    infinity.
+    """
+    return json.dumps(
+        {
+            key: None if isinstance(value, float) and math.isinf(value) else value
+            for key, value in result.items()
+        },
+        default=str,
+    )
+
+
+def _init_worker(data: DataHandler):
+    global _SHARED_DATA
+    _SHARED_DATA = data
+
+
+def _run_config(
+    strategy_cls: Type[BaseStrategy],
+    symbol: str,
+    params: Dict[str, Any],
+    engine: str,
+    days: List[date],
+) -> Dict[str, Any]:
+    strategy = strategy_cls(symbol=symbol, **params)
+    backtester = Backtester(strategy, engine=engine, data=_SHARED_DATA)
+    backtester.run_days(backtester.prefilter_days(days), progress=False)
+    return {"params": params, **strategy.portfolio.stats(days)}
+
+
+class ParameterSweep:
+    """
+    Backtests many parameter sets of one strategy over the same data.
+
+    The dataset is loaded once and shared read-only with a worker pool; each
+    configuration's metrics are written to `output` (JSON lines) as soon as
+    it finishes, replacing the results of any earlier run.
+    """
+
+    def __init__(
+        self,
+        strategy_cls: Type[BaseStrategy],
+        symbol: str,
+        configs: List[Dict[str, Any]],
+        output: str,
+        workers: Optional[int] = None,
+        engine: str = "cursor",
+        data: Optional[DataHandler] = None,
+    ):
+        self.strategy_cls = strategy_cls
+        self.symbol = symbol
+        self.configs = configs
+        self.output = output
+        self.workers = workers or os.cpu_count()
+        self.engine = engine
+        self.data = data or DataHandler(symbol, include_synthetic=True)
+
+    def run(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        days = get_trading_days(start_date, end_date)
+        results = []
+
+        with open(self.output, "w") as out, ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.data,),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _run_config, self.strategy_cls, self.symbol, params, self.engine, days
+                )
+                for params in self.configs
+            ]
+            for future in tqdm(
+                as_completed(futures), total=len(futures), desc="Sweeping"
+            ):
+                result = future.result()
+                results.append(result)
+                out.write(result_line(result) + "\n")
+                out.flush()
+
+        return results
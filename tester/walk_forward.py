@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Type
+
+from tqdm import tqdm
+
+from data.data_handler import DataHandler
+from portfolio.models import Position
+from portfolio.portfolio import Portfolio
+from strategy.base_strategy import BaseStrategy
+from tester.backtester import Backtester, get_trading_days
+from tester.cache import DayResultCache, strategy_fingerprint
+
+
+@dataclass
+class Window:
+    in_sample: List[date]
+    out_of_sample: List[date]
+
+
+@dataclass
+class WindowResult:
+    window: Window
+    params: Dict[str, Any]
+    in_sample_score: float
+    out_of_sample: Dict[str, float]
+
+
+class WalkForward:
+    """
+    Rolling in-sample optimization with out-of-sample evaluation.
+
+    Trading days are split into windows of `in_sample_days` followed by
+    `out_of_sample_days`, advancing by `step_days`. In each window every
+    configuration is scored on the in-sample days by `objective` (a key of
+    Portfolio.stats()), and the best one is evaluated out of sample. Results
+    are cached per (configuration, day), so overlapping windows and repeated
+    runs only simulate days they have not seen.
+    """
+
+    def __init__(
+        self,
+        strategy_cls: Type[BaseStrategy],
+        symbol: str,
+        configs: List[Dict[str, Any]],
+        in_sample_days: int = 60,
+        out_of_sample_days: int = 20,
+        step_days: Optional[int] = None,
+        objective: str = "total_pnl",
+        cache: Optional[DayResultCache] = None,
+        engine: str = "cursor",
+        data: Optional[DataHandler] = None,
+    ):
+        self.strategy_cls = strategy_cls
+        self.symbol = symbol
+        self.configs = configs
+        self.in_sample_days = in_sample_days
+        self.out_of_sample_days = out_of_sample_days
+        self.step_days = step_days or out_of_sample_days
+        self.objective = objective
+        self.cache = cache or DayResultCache()
+        self.engine = engine
+        self.data = data or DataHandler(symbol, include_synthetic=True)
+
+    def windows(self, days: List[date]) -> List[Window]:
+        windows = []
+        span = self.in_sample_days + self.out_of_sample_days
+        for start in range(0, len(days) - span + 1, self.step_days):
+            windows.append(
+                Window(
+                    in_sample=days[start : start + self.in_sample_days],
+                    out_of_sample=days[start + self.in_sample_days : start + span],
+                )
+            )
+        return windows
+
+    def _day_positions(self, params: Dict[str, Any], day: date) -> List[Position]:
+        # Keyed like Backtester.run_cached, so a persistent cache is not reused
+        # once the strategy's source or the day's data changes.
+        strategy = self.strategy_cls(symbol=self.symbol, **params)
+        backtester = Backtester(strategy, engine=self.engine, data=self.data)
+        config = strategy_fingerprint(strategy)
+        fingerprint = backtester.day_fingerprint(day)
+        positions = self.cache.get(config, day, fingerprint)
+        if positions is None:
+            backtester.run_days([day], progress=False)
+            positions = list(strategy.portfolio.positions_dt.values())
+            self.cache.put(config, day, positions, fingerprint)
+        return positions
+
+    def evaluate(self, params: Dict[str, Any], days: List[date]) -> Portfolio:
+        portfolio = Portfolio()
+        for day in days:
+            for position in self._day_positions(params, day):
+                portfolio.record_position(position.contract.symbol, position)
+        return portfolio
+
+    def run(self, start_date: date, end_date: date) -> List[WindowResult]:
+        windows = self.windows(get_trading_days(start_date, end_date))
+        if not windows:
+            raise ValueError("Date range is shorter than one in-sample + out-of-sample window.")
+
+        results = []
+        for window in tqdm(windows, desc="Walk-forward windows"):
+            scores = [
+                self.evaluate(params, window.in_sample).stats(window.in_sample)[
+                    self.objective
+                ]
+                for params in self.configs
+            ]
+            best_i = max(range(len(scores)), key=scores.__getitem__)
+            best_score, best_params = scores[best_i], self.configs[best_i]
+            results.append(
+                WindowResult(
+                    window=window,
+                    params=best_params,
+                    in_sample_score=best_score,
+                    out_of_sample=self.evaluate(best_params, window.out_of_sample).stats(
+                        window.out_of_sample
+                    ),
+                )
+            )
+        return results
+
+    def out_of_sample_days(self, results: List[WindowResult]) -> List[date]:
+        """
+        Every day covered by the out-of-sample windows, in order.
+        """
+        return sorted({day for result in results for day in result.window.out_of_sample})
+
+    def out_of_sample_portfolio(self, results: List[WindowResult]) -> Portfolio:
+        """
+        Concatenates every window's out-of-sample trades.
+        """
+        portfolio = Portfolio()
+        for result in results:
+            portfolio.merge(self.evaluate(result.params, result.window.out_of_sample))
+        return portfolio